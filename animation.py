@@ -0,0 +1,63 @@
+import pygame
+
+
+class Animation:
+    """A cycle of frames shared by every sprite of one type. Frames are built
+    once and never modified, so any number of sprites can show them.
+
+    === Public Attributes ===
+    frames: surfaces of the cycle, in playback order
+    interval: time (ms) each frame stays on screen
+    """
+    frames: tuple
+    interval: int
+
+    def __init__(self, frames, interval):
+        self.frames = tuple(frames)
+        self.interval = interval
+
+    @classmethod
+    def spin(cls, image, interval, step=90):
+        """Builds the cycle of image turning counterclockwise by step degrees
+        per frame. Every frame is rotated from the original image."""
+        count = 360 // step
+        return cls([pygame.transform.rotate(image, i * step)
+                    for i in range(count)], interval)
+
+
+class Animator:
+    """Playback position of one sprite within a shared Animation. While it
+    plays, a repeating timer moves the index on, so no surface is allocated
+    and a sprite costs nothing in the steps its frame does not change.
+
+    === Public Attributes ===
+    animation: the shared cycle being played
+    index: position of the current frame in animation.frames
+    """
+    __slots__ = ('animation', 'index', '_timer')
+    index: int
+
+    def __init__(self, animation):
+        self.animation = animation
+        self.index = 0
+        self._timer = None
+
+    @property
+    def image(self):
+        """Current frame"""
+        return self.animation.frames[self.index]
+
+    def play(self, timers):
+        """Starts advancing a frame every interval on the TimerWheel
+        timers"""
+        if self._timer is None:
+            self._timer = timers.every(self.animation.interval, self._next)
+
+    def stop(self):
+        """Holds the current frame"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _next(self):
+        self.index = (self.index + 1) % len(self.animation.frames)
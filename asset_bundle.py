@@ -0,0 +1,187 @@
+"""Packs every sprite image, pre-scaled for common display sizes, into one
+bundle file that Assets memory-maps at startup instead of loading and
+scaling each image:
+
+    python asset_bundle.py
+    python asset_bundle.py --sizes 1920x1080 2560x1440
+
+Images with transparency share one RGBA atlas page per display size;
+opaque ones (the background) get RGB pages of their own. Re-run the packer
+whenever an image in images/ changes.
+"""
+import argparse
+import json
+import math
+import mmap
+import struct
+
+import pygame
+
+MAGIC = b'SWAB'
+VERSION = 1
+# Magic, version and the length of the JSON index that follows
+_HEADER = struct.Struct('<4sHI')
+# Pixel data starts on a multiple of this many bytes
+_ALIGN = 64
+SIZES = ((1280, 720), (1366, 768), (1600, 900), (1920, 1080),
+         (2560, 1080), (2560, 1440), (3440, 1440), (3840, 2160))
+
+
+def _aligned(offset):
+    return -(-offset // _ALIGN) * _ALIGN
+
+
+def _key(screen_size):
+    return '{}x{}'.format(*screen_size)
+
+
+def _shelf_pack(images, padding=1):
+    """Places images (name: surface) on as few rows as a roughly square
+    page allows. Returns the page size and name: (x, y) positions."""
+    order = sorted(images, key=lambda name: -images[name].get_height())
+    area = sum((image.get_width() + padding) *
+               (image.get_height() + padding) for image in images.values())
+    width = max(max(image.get_width() for image in images.values()),
+                int(math.sqrt(area) * 1.2))
+    positions = {}
+    x = y = row_height = 0
+    for name in order:
+        w, h = images[name].get_size()
+        if x + w > width:
+            x = 0
+            y += row_height + padding
+            row_height = 0
+        positions[name] = (x, y)
+        x += w + padding
+        row_height = max(row_height, h)
+    return (width, y + row_height), positions
+
+
+def pack(path, sizes=SIZES):
+    """Writes a bundle holding the images Assets needs at each display size
+    in sizes"""
+    # Imported here so the loader does not depend on the game modules
+    from assets import Assets
+    from settings import Settings
+    sources = {}
+    buckets = {}
+    pages = []
+    for screen_size in sizes:
+        images = {}
+        for name, (filename, size) in Assets.specs(
+                Settings(screen_size)).items():
+            if filename not in sources:
+                sources[filename] = pygame.image.load(f'images/{filename}')
+            image = sources[filename]
+            if size is not None:
+                image = pygame.transform.smoothscale(image, size)
+            images[name] = image
+        index = {}
+        bucket_pages = []
+        clear = {name: image for name, image in images.items()
+                 if image.get_flags() & pygame.SRCALPHA}
+        if clear:
+            page_size, positions = _shelf_pack(clear)
+            page = pygame.Surface(page_size, pygame.SRCALPHA)
+            for name, (x, y) in positions.items():
+                # Adding onto a clear page copies the pixels unblended
+                page.blit(clear[name], (x, y),
+                          special_flags=pygame.BLEND_RGBA_ADD)
+                index[name] = [len(bucket_pages), x, y,
+                               *clear[name].get_size()]
+            bucket_pages.append((page, 'RGBA'))
+        for name, image in images.items():
+            if name not in clear:
+                index[name] = [len(bucket_pages), 0, 0, *image.get_size()]
+                bucket_pages.append((image, 'RGB'))
+        buckets[_key(screen_size)] = {'images': index,
+                                      'pages': bucket_pages}
+    # Pixel data is laid out after the index, every page aligned
+    offset = 0
+    for bucket in buckets.values():
+        entries = []
+        for surface, fmt in bucket['pages']:
+            data = pygame.image.tobytes(surface, fmt)
+            entries.append({'offset': offset, 'size': surface.get_size(),
+                            'format': fmt, 'length': len(data)})
+            pages.append((offset, data))
+            offset = _aligned(offset + len(data))
+        bucket['pages'] = entries
+    index = json.dumps({'version': VERSION, 'buckets': buckets}).encode()
+    start = _aligned(_HEADER.size + len(index))
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(index)))
+        f.write(index)
+        for offset, data in pages:
+            f.seek(start + offset)
+            f.write(data)
+        return f.tell()
+
+
+class AssetBundle:
+    """Read-only view of a bundle written by pack. The file is memory-mapped
+    and each display size's pages are only read when images asks for them.
+
+    === Public Attributes ===
+    path: file the bundle was opened from
+    sizes: display sizes the bundle holds images for
+    """
+    path: str
+    sizes: list[tuple[int, int]]
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, length = _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a version {VERSION} bundle')
+        index = json.loads(self._map[_HEADER.size:_HEADER.size + length])
+        self._buckets = index['buckets']
+        self._start = _aligned(_HEADER.size + length)
+        self.sizes = [tuple(map(int, key.split('x')))
+                      for key in self._buckets]
+
+    def images(self, screen_size):
+        """Returns name: surface for every image packed for screen_size, or
+        None if the bundle has none. Each surface is a subsurface of a page
+        converted to the display format, so the display must be set."""
+        bucket = self._buckets.get(_key(screen_size))
+        if bucket is None:
+            return None
+        pages = []
+        for page in bucket['pages']:
+            start = self._start + page['offset']
+            with memoryview(self._map)[start:start + page['length']] as view:
+                surface = pygame.image.frombuffer(view, page['size'],
+                                                  page['format'])
+                # Converting copies the pixels out of the mapped file
+                if page['format'] == 'RGBA':
+                    pages.append(surface.convert_alpha())
+                else:
+                    pages.append(surface.convert())
+                del surface
+        return {name: pages[page].subsurface((x, y, w, h))
+                for name, (page, x, y, w, h) in bucket['images'].items()}
+
+    def close(self):
+        self._map.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default='images/assets.bundle')
+    parser.add_argument('--sizes', nargs='+', metavar='WxH',
+                        help='display sizes to pack for (default: common '
+                             'monitor sizes)')
+    args = parser.parse_args()
+    sizes = SIZES
+    if args.sizes:
+        sizes = [tuple(map(int, size.split('x'))) for size in args.sizes]
+    length = pack(args.out, sizes)
+    print(f'wrote {args.out}: {len(sizes)} display sizes, '
+          f'{length / 2 ** 20:.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
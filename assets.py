@@ -0,0 +1,231 @@
+import os
+
+import pygame
+
+from animation import Animation
+from asset_bundle import AssetBundle
+
+
+class ScaledImages(dict):
+    """Copies of the shared surfaces at one scale, each made the first time
+    it is looked up
+
+    === Public Attributes ===
+    scale: size of the copies relative to the originals
+    """
+    scale: float
+
+    def __init__(self, scale):
+        super().__init__()
+        self.scale = scale
+
+    def __missing__(self, image):
+        width, height = image.get_size()
+        size = (max(1, round(width * self.scale)),
+                max(1, round(height * self.scale)))
+        small = self[image] = pygame.transform.smoothscale(image, size)
+        return small
+
+
+class Assets:
+    """Registry for every image the game draws. Each image is loaded from
+    disk, scaled for the current display and converted to the display pixel
+    format exactly once, then the same surface is shared by every sprite.
+    === NOT TO BE INSTANTIATED BEFORE pygame.display.set_mode ===
+
+    === Public Attributes ===
+    loads: number of images actually read from disk
+    scales: number of images actually scaled
+    skipped_loads: load calls avoided since the registry was built
+    skipped_scales: scale calls avoided since the registry was built
+    frame_skipped_loads: load calls avoided during the last finished frame
+    frame_skipped_scales: scale calls avoided during the last finished frame
+    frame_skipped_rotations: rotate calls avoided during the last finished
+        frame
+    laser_atlas_bytes: pixel memory held by the laser rotation atlas
+    masks: number of collision masks built
+    bundled: True iff the images came pre-scaled from the asset bundle
+    scaled: maps each shared surface to its copy at the render scale
+    """
+    loads: int
+    scales: int
+    skipped_loads: int
+    skipped_scales: int
+    frame_skipped_loads: int
+    frame_skipped_scales: int
+    frame_skipped_rotations: int
+    laser_atlas_bytes: int
+    masks: int
+    bundled: bool
+    scaled: ScaledImages
+
+    LASER_COLOURS = ('blue', 'red', 'green')
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._specs = self.specs(settings)
+        self.loads = 0
+        self.scales = 0
+        self.skipped_loads = 0
+        self.skipped_scales = 0
+        self.frame_skipped_loads = 0
+        self.frame_skipped_scales = 0
+        self._pending_loads = 0
+        self._pending_scales = 0
+        self.frame_skipped_rotations = 0
+        self._pending_rotations = 0
+        # Pre-scaled images from the bundle, when it has this display size
+        self._surfaces = self._from_bundle(settings.asset_bundle)
+        self.bundled = self._surfaces is not None
+        if not self.bundled:
+            self._surfaces = {name: self._build(name) for name in self._specs}
+        self._laser_atlas = {}
+        self._angle_steps = 0
+        self.laser_atlas_bytes = 0
+        self._build_laser_atlas()
+        # Collision mask of every shared surface (including each laser
+        # rotation and spin frame), built the first time it is needed
+        self._masks = {}
+        self.masks = 0
+        # Copy of every shared surface at the render scale, built the first
+        # time ScaledRenderer draws it
+        self.scaled = ScaledImages(1.0)
+        # Spin cycles shared by every sprite of the same type
+        self._animations = {
+            'orb': Animation.spin(self._surfaces['orb'],
+                                  settings.rotation_speed),
+            'red': Animation.spin(self._surfaces['red'], 150),
+        }
+
+    @staticmethod
+    def specs(settings):
+        """name: (file in images/, scaled size or None to keep original size)
+        for every image, at the display size of settings"""
+        sr = settings.screen_ratio
+        specs = {
+            'bg': ('bg.bmp', (settings.screen_width, settings.screen_height)),
+            'paused': ('paused.bmp', (int(400 * sr), int(208 * sr))),
+            'orb': ('orb.bmp', (int(80 * sr), int(80 * sr))),
+            'cloud': ('enemy.bmp', (int(65 * sr), int(90 * sr))),
+            'red': ('red.bmp', (int(150 * sr), int(150 * sr))),
+            'crosshair': ('crosshair.bmp', (17, 17)),
+        }
+        for colour in Assets.LASER_COLOURS:
+            specs[f'{colour}-laser'] = (f'{colour}-laser.bmp',
+                                        (int(40 * sr), int(30 * sr)))
+        return specs
+
+    def _from_bundle(self, path):
+        """Every image sliced out of the bundle at path, or None if there
+        is no bundle or it does not match this display"""
+        if not path or not os.path.exists(path):
+            return None
+        bundle = AssetBundle(path)
+        try:
+            surfaces = bundle.images((self.settings.screen_width,
+                                      self.settings.screen_height))
+        finally:
+            bundle.close()
+        if surfaces is None:
+            return None
+        for name, (_, size) in self._specs.items():
+            # A bundle packed before an image or its size changed is stale
+            if name not in surfaces or \
+                    (size is not None and surfaces[name].get_size() != size):
+                return None
+        return surfaces
+
+    def _build(self, name):
+        """Loads, scales and converts the image registered under name"""
+        filename, size = self._specs[name]
+        image = pygame.image.load(f'images/{filename}')
+        self.loads += 1
+        if size is not None:
+            image = pygame.transform.smoothscale(image, size)
+            self.scales += 1
+        # Sprites keep their transparent edges; opaque images blit faster
+        # without an alpha channel
+        if image.get_flags() & pygame.SRCALPHA:
+            return image.convert_alpha()
+        return image.convert()
+
+    def _build_laser_atlas(self):
+        """Pre-renders every laser colour at each quantized angle between
+        -90 and 90 degrees (the range math.atan can produce)"""
+        # Round so that the table always ends exactly on 90 degrees
+        self._angle_steps = max(1, round(180 / self.settings.laser_angle_step))
+        step = 180 / self._angle_steps
+        for colour in self.LASER_COLOURS:
+            image = self._surfaces[f'{colour}-laser']
+            frames = []
+            for i in range(self._angle_steps + 1):
+                frame = pygame.transform.rotate(image, -(i * step - 90))
+                frames.append(frame)
+                self.laser_atlas_bytes += \
+                    frame.get_pitch() * frame.get_height()
+            self._laser_atlas[colour] = frames
+
+    def get(self, name):
+        """Returns the shared surface registered under name. Callers must
+        not draw onto the returned surface."""
+        self.count_spawn(name)
+        return self._surfaces[name]
+
+    def laser(self, colour, angle):
+        """Returns the shared laser surface of the given colour, rotated
+        clockwise by the table angle closest to angle (in degrees, -90 to 90)
+        """
+        self._pending_loads += 1
+        self._pending_scales += 1
+        self._pending_rotations += 1
+        i = round((angle + 90) * self._angle_steps / 180)
+        frames = self._laser_atlas[colour]
+        return frames[min(max(i, 0), self._angle_steps)]
+
+    def mask(self, image):
+        """Returns the collision mask of image, which must be one of the
+        shared surfaces handed out by this registry"""
+        mask = self._masks.get(image)
+        if mask is None:
+            mask = self._masks[image] = pygame.mask.from_surface(image)
+            self.masks += 1
+        return mask
+
+    def set_render_scale(self, scale):
+        """Changes the size scaled hands images out at, dropping the copies
+        made for the old size"""
+        if scale != self.scaled.scale:
+            self.scaled = ScaledImages(scale)
+
+    def animation(self, name):
+        """Returns the shared spin cycle registered under name"""
+        return self._animations[name]
+
+    def count_spawn(self, name):
+        """Counts a sprite built with the image registered under name,
+        which it shares instead of loading and scaling its own"""
+        self._pending_loads += 1
+        if self._specs[name][1] is not None:
+            self._pending_scales += 1
+
+    def end_frame(self):
+        """Closes the bookkeeping for the current frame"""
+        self.frame_skipped_loads = self._pending_loads
+        self.frame_skipped_scales = self._pending_scales
+        self.frame_skipped_rotations = self._pending_rotations
+        self.skipped_loads += self._pending_loads
+        self.skipped_scales += self._pending_scales
+        self._pending_loads = 0
+        self._pending_scales = 0
+        self._pending_rotations = 0
+
+    def report(self):
+        """Returns summary lines of the work the registry has saved, for
+        the profiler overlay"""
+        return [f'assets: {self.loads} loads, {self.scales} scales at '
+                f'startup; laser atlas {self._angle_steps + 1} angles in '
+                f'{self.laser_atlas_bytes // 1024} KiB',
+                f'skipped {self.frame_skipped_loads} loads, '
+                f'{self.frame_skipped_scales} scales, '
+                f'{self.frame_skipped_rotations} rotations last frame '
+                f'({self.skipped_loads} / {self.skipped_scales} total)']
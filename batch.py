@@ -0,0 +1,147 @@
+"""Runs many seeded headless games across every CPU core and summarises
+them per combination of settings.
+
+Every --set adds a setting and the values to try; each combination of
+values is played once per seed:
+
+    python batch.py --seeds 200 --set cloud_cooldown=800,1600 \
+        --set max_enemies=69,300 --out pacing.json
+
+Settings are changed before the game is built, so the ones it is built
+from (sim_rate, batched_enemies, flow_field, ...) can be varied too.
+"""
+import argparse
+import ast
+import itertools
+import json
+import multiprocessing
+import os
+import statistics
+import time
+
+from headless import orbit_script, run_headless
+from profiler import percentile
+
+
+def parse_setting(text):
+    """'name=v1,v2' -> (name, [v1, v2]), with numbers parsed as such"""
+    name, _, values = text.partition('=')
+    if not name or not values:
+        raise argparse.ArgumentTypeError(f'expected name=value[,value], '
+                                         f'got {text!r}')
+    parsed = []
+    for value in values.split(','):
+        try:
+            parsed.append(ast.literal_eval(value))
+        except (ValueError, SyntaxError):
+            parsed.append(value)
+    return name, parsed
+
+
+def grid(settings):
+    """Every combination of the (name, values) in settings, as dicts"""
+    names = [name for name, _ in settings]
+    return [dict(zip(names, values)) for values in
+            itertools.product(*(values for _, values in settings))]
+
+
+def simulate(task):
+    """Plays one game; runs in a worker process"""
+    index, overrides, seed, frames, fire_every = task
+    # The dummy display of the headless game is 1024 x 768
+    script = orbit_script(frames, (512, 384), fire_every=fire_every)
+    timings = []
+    state = run_headless(frames, seed, script, overrides=overrides,
+                         timings=timings)
+    return index, {
+        'seed': seed,
+        'score': state['score'],
+        'alive': state['alive'],
+        'frames': state['frames'],
+        'survival_s': state['time'] / 1000,
+        'frame_mean': statistics.fmean(timings) if timings else 0.0,
+        'frame_p95': percentile(timings, 95),
+        'frame_p99': percentile(timings, 99),
+    }
+
+
+def summarise(overrides, runs):
+    """Statistics over every run of one combination of settings"""
+    scores = [run['score'] for run in runs]
+    survived = [run['survival_s'] for run in runs]
+    return {
+        'settings': overrides,
+        'runs': len(runs),
+        'score': {'mean': statistics.fmean(scores),
+                  'median': statistics.median(scores),
+                  'max': max(scores)},
+        'survival_s': {'mean': statistics.fmean(survived),
+                       'median': statistics.median(survived),
+                       'min': min(survived)},
+        'survived_all_frames': sum(run['alive'] for run in runs) / len(runs),
+        'frame_ms': {
+            'mean': statistics.fmean(run['frame_mean'] for run in runs),
+            'p95_mean': statistics.fmean(run['frame_p95'] for run in runs),
+            'p99_max': max(run['frame_p99'] for run in runs)},
+    }
+
+
+def run(settings, seeds, frames, fire_every=4, processes=None):
+    """Plays every combination of settings once per seed in a process pool
+    and returns one summary per combination"""
+    combos = grid(settings)
+    tasks = [(i, overrides, seed, frames, fire_every)
+             for i, overrides in enumerate(combos) for seed in seeds]
+    runs = [[] for _ in combos]
+    # SDL turns SIGTERM into a quit event, which would keep the pool from
+    # stopping its workers
+    os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+    with multiprocessing.Pool(processes) as pool:
+        done = 0
+        for index, result in pool.imap_unordered(simulate, tasks,
+                                                 chunksize=4):
+            runs[index].append(result)
+            done += 1
+            print(f'\r{done}/{len(tasks)} games', end='', flush=True)
+    print()
+    return [summarise(overrides, sorted(results, key=lambda r: r['seed']))
+            for overrides, results in zip(combos, runs)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seeds', type=int, default=100,
+                        help='games per combination (seeds 0 to N - 1)')
+    parser.add_argument('--frames', type=int, default=5000,
+                        help='most frames a game is played for')
+    parser.add_argument('--fire-every', type=int, default=4,
+                        help='frames between shots (0 to never fire)')
+    parser.add_argument('--set', type=parse_setting, action='append',
+                        default=[], metavar='NAME=V1,V2',
+                        help='setting to vary and the values to try')
+    parser.add_argument('--processes', type=int,
+                        help='worker processes (default: one per core)')
+    parser.add_argument('--out', default='batch_results.json')
+    args = parser.parse_args()
+    start = time.perf_counter()
+    summaries = run(args.set, range(args.seeds), args.frames,
+                    args.fire_every, args.processes)
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seeds': args.seeds,
+        'frames': args.frames,
+        'fire_every': args.fire_every,
+        'wall_time_s': time.perf_counter() - start,
+        'results': summaries,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    for summary in summaries:
+        print(f"{summary['settings']}: score {summary['score']['mean']:.0f}"
+              f" survived {summary['survival_s']['mean']:.1f} s"
+              f" frame {summary['frame_ms']['mean']:.2f} ms")
+    print(f'wrote {args.out}')
+
+
+if __name__ == '__main__':
+    main()
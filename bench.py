@@ -0,0 +1,132 @@
+"""Benchmarks every phase of the main loop at increasing entity counts.
+
+Each run keeps a headless game topped up to N enemies and N lasers, times
+each phase of a frame separately and writes the results as JSON so runs can
+be compared:
+
+    python bench.py --out before.json
+    python bench.py --out after.json --compare before.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import time
+
+import pygame
+
+from headless import make_game
+from state import GameState
+
+COUNTS = (10, 100, 1000, 10000)
+
+
+def phases(game):
+    """(name, callable) for each phase of a game-phase frame, in loop order"""
+    dt = game.dt
+    return [
+        ('_check_events', game._check_events),
+        ('timers.advance', game.timers.advance),
+        ('orb.update', lambda: game.orb.update(dt)),
+        ('lasers.update', lambda: game.lasers.update(dt)),
+        ('enemies.update', lambda: game._update_enemies(dt)),
+        ('_spawn_enemies', game._spawn_enemies),
+        ('_update_broadphase', game._update_broadphase),
+        ('laser_collisions', game.laser_collisions),
+        ('orb_collisions', game.orb_collisions),
+        ('_update_screen', game._update_screen),
+    ]
+
+
+def top_up(game, count):
+    """Refills the game to count enemies and count lasers, reviving the orb
+    if it died during the last frame"""
+    if game.state.current is not GameState.PLAYING:
+        game.state.change(GameState.PLAYING)
+    while len(game.enemies) < count:
+        game.enemies.add(game.Cloud())
+    game.settings.max_lasers = count
+    while len(game.lasers) < count:
+        game.laser_pool.fire()
+
+
+def bench_count(count, frames, seed):
+    """Times frames frames at count enemies and lasers. Returns the timings
+    of each phase in ms."""
+    game = make_game(seed)
+    # Aim away from the orb so new lasers spread over the screen
+    game.input.mouse_pos = (0, 0)
+    timings = {name: [] for name, _ in phases(game)}
+    for _ in range(frames):
+        top_up(game, count)
+        game.game_clock.advance(game.dt)
+        for name, phase in phases(game):
+            start = time.perf_counter()
+            phase()
+            timings[name].append((time.perf_counter() - start) * 1000)
+        game.assets.end_frame()
+    return timings
+
+
+def summarise(samples):
+    return {'frames': len(samples),
+            'mean_ms': statistics.fmean(samples),
+            'median_ms': statistics.median(samples),
+            'min_ms': min(samples),
+            'max_ms': max(samples)}
+
+
+def run(counts, frames, seed):
+    results = {}
+    for count in counts:
+        # Fewer frames for the large counts so a full run stays practical
+        n = max(3, min(frames, 20000 // count))
+        timings = bench_count(count, n, seed)
+        results[str(count)] = {name: summarise(samples)
+                               for name, samples in timings.items()}
+        total = sum(r['mean_ms'] for r in results[str(count)].values())
+        print(f'{count:>6} entities: {total:9.2f} ms/frame over {n} frames')
+    return results
+
+
+def compare(results, baseline):
+    """Prints the mean time of each phase relative to a previous run"""
+    for count, phase_results in results.items():
+        if count not in baseline:
+            continue
+        for name, r in phase_results.items():
+            before = baseline[count].get(name)
+            if before and before['mean_ms']:
+                ratio = r['mean_ms'] / before['mean_ms']
+                print(f'{count:>6} {name:<20} {before["mean_ms"]:9.3f} -> '
+                      f'{r["mean_ms"]:9.3f} ms  (x{ratio:.2f})')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=COUNTS)
+    parser.add_argument('--frames', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='bench_results.json')
+    parser.add_argument('--compare', metavar='JSON',
+                        help='earlier results to compare against')
+    args = parser.parse_args()
+    results = run(args.counts, args.frames, args.seed)
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pygame': pygame.version.ver,
+        'machine': platform.platform(),
+        'seed': args.seed,
+        'results': results,
+    }
+    with open(args.out, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'wrote {args.out}')
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f)['results'])
+
+
+if __name__ == '__main__':
+    main()
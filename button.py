@@ -10,7 +10,12 @@ class Button:
         self.font = font
         self.base_color, self.hovering_color = base_color, hovering_color
         self.text_input = text_input
-        self.text = self.font.render(self.text_input, True, self.base_color)
+        # Both colours are rendered once; changeColor only swaps them
+        self.base_text = self.font.render(self.text_input, True,
+                                          self.base_color)
+        self.hovering_text = self.font.render(self.text_input, True,
+                                              self.hovering_color)
+        self.text = self.base_text
         if self.image is None:
             self.image = self.text
         self.rect = self.image.get_rect(center=(self.x_pos, self.y_pos))
@@ -30,7 +35,6 @@ class Button:
     def changeColor(self, position):
         if position[0] in range(self.rect.left, self.rect.right) and \
                 position[1] in range(self.rect.top, self.rect.bottom):
-            self.text = self.font.render(self.text_input, True,
-                                         self.hovering_color)
+            self.text = self.hovering_text
         else:
-            self.text = self.font.render(self.text_input, True, self.base_color)
+            self.text = self.base_text
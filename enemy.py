@@ -1,61 +1,108 @@
-import random
 import math
 
-import pygame
-from pygame.sprite import Sprite
-from settings import Settings
+from animation import Animator
+from entity import Entity
+from enemy_store import StoredField, CLOUD, RED
 
 
-class Enemy(Sprite):
+class Enemy(Entity):
     """Abstract class for all enemies
-    === NOT TO BE INSTANTIATED ==="""
-    def __init__(self, fof_game):
+    === NOT TO BE INSTANTIATED ===
+
+    Enemies are built from a class bound to a game (see Entity.bind), which
+    holds everything they share: settings, assets, the orb and the spawn
+    director.
+
+    While the game batches enemies (fof_game.enemy_store is not None), x, y
+    and hp live in the store from the moment the enemy joins a group, and
+    the store moves it instead of update. Otherwise the enemy makes its
+    movement decisions on timers while it is in play.
+
+    === Public Attributes ===
+    rect: position and size of the enemy
+    slot: index of the enemy in the store (None while not registered)
+    last_moved: time (ms) the store counts the next movement decision from
+    """
+    __slots__ = ('rect', 'slot', 'last_moved', '_decision', '_x', '_y',
+                 '_hp')
+    x = StoredField()
+    y = StoredField()
+    hp = StoredField()
+    kind = None
+
+    @classmethod
+    def shared_state(cls, fof_game):
+        state = super().shared_state(fof_game)
+        state.update(store=fof_game.enemy_store,
+                     director=fof_game.spawner,
+                     flow_field=fof_game.flow_field)
+        return state
+
+    def __init__(self):
         super().__init__()
-        self.screen = fof_game.screen
-        self.settings = Settings()
-        self.sr = self.settings.screen_ratio
-        self.orb = fof_game.orb
+        self.slot = None
         self.last_moved = 0
+        self._decision = None
         self.rect = None
-        self.image = None
-        self.x = None
-        self.y = None
-        self.speed = None
-
-    def spawn(self):
-        # Min/max points where enemies can spawn
-        spawn_min_x = -20
-        spawn_max_x = self.settings.screen_width + 20
-        spawn_min_y = -20
-        spawn_max_y = self.settings.screen_height + 20
-        # Below will determine where enemy will spawn (anywhere on the border)
-        side = random.choice([1, 2, 3, 4])
-        if side == 1:
-            # Spawn on the top
-            self.rect.center = (random.choice(range(spawn_min_x, spawn_max_x)),
-                                spawn_min_y)
-        elif side == 2:
-            # Spawn at bottom
-            self.rect.center = (random.choice(range(spawn_min_x, spawn_max_x)),
-                                spawn_max_y)
-        elif side == 3:
-            # Spawn on left
-            self.rect.center = (spawn_min_x,
-                                random.choice(range(spawn_min_y, spawn_max_y)))
+
+    def add_internal(self, group):
+        entering = not self.alive()
+        super().add_internal(group)
+        if entering:
+            self._enter_play()
+
+    def remove_internal(self, group):
+        super().remove_internal(group)
+        if not self.alive():
+            self._leave_play()
+
+    def kill(self):
+        # Entity.kill bypasses remove_internal on the enemy itself
+        leaving = self.alive()
+        super().kill()
+        if leaving:
+            self._leave_play()
+
+    def _enter_play(self):
+        """Joins the store, or starts deciding on timers without one"""
+        if self.store is not None:
+            self.store.add(self)
         else:
-            # Spawn on right
-            self.rect.center = (spawn_max_x,
-                                random.choice(range(spawn_min_y, spawn_max_y)))
+            self._decide()
+
+    def _leave_play(self):
+        """Leaves the store and stops every timer of the enemy"""
+        if self.slot is not None:
+            self.store.remove(self)
+        if self._decision is not None:
+            self._decision.cancel()
+            self._decision = None
+
+    def _decide(self):
+        """Makes a movement decision and schedules the next one"""
+        raise NotImplementedError
+
+    def spawn(self, position=None):
+        """Centres the enemy on position, or on the spawn director's next
+        point on the border"""
+        if position is None:
+            position = self.director.next_position()
+        self.rect.center = position
         self.x = float(self.rect.x)
         self.y = float(self.rect.y)
 
-    def update(self) -> None:
+    def update(self, dt) -> None:
+        """Moves the enemy for a simulation step of dt seconds"""
         raise NotImplementedError
 
     def _calculate_proj_vector(self) -> tuple[float, float]:
         """Gets the vector towards orb (Normalized according to desired
-        magnitude). Magnitude of the vector in this case is the speed or enemy.
+        magnitude). Magnitude of the vector in this case is the speed or enemy,
+        in pixels per second.
         """
+        if self.flow_field is not None:
+            ux, uy = self.flow_field.sample(*self.rect.center)
+            return ux * self.speed, uy * self.speed
         location = self.orb.rect.center
         resultant = (location[0] - self.rect.center[0],
                      location[1] - self.rect.center[1])
@@ -71,75 +118,144 @@ class Enemy(Sprite):
 
 
 class Cloud(Enemy):
-    def __init__(self, fof_game):
+    """
+    === Public Attributes ===
+    foo: last random-walk roll (0 to 100)
+    """
+    __slots__ = ('foo',)
+    kind = CLOUD
+
+    @classmethod
+    def shared_state(cls, fof_game):
+        state = super().shared_state(fof_game)
+        # Clouds never change image, so they all show this one
+        state.update(image=fof_game.assets.get('cloud'))
+        return state
+
+    @property
+    def speed(self):
+        return self.settings.cloud_speed
+
+    def __init__(self, position=None):
         """Initializes cloud object"""
-        super().__init__(fof_game)
-        self.speed = self.settings.cloud_speed
+        super().__init__()
         self.foo = 0
         self.hp = 1
 
-        image = pygame.image.load('images/enemy.bmp')
-        self.image = \
-            pygame.transform.smoothscale(image, (int(65 * self.sr),
-                                                 int(90 * self.sr)))
+        self.assets.count_spawn('cloud')
         self.rect = self.image.get_rect()
 
-        self.spawn()
+        self.spawn(position)
 
-    def update(self):
-        """Updates movement for this cloud (Decides which direction to go)."""
-        now = pygame.time.get_ticks()
+    def _decide(self):
         # Makes a chance decision every 15 ms (20% chance of moving towards orb)
-        if now - self.last_moved > 15:
-            self.foo = random.randint(0, 100)
-            self.last_moved = now
+        # or, far from the orb, every far_cloud_interval ms while it is set
+        self.foo = self.rng.randint(0, 100)
+        interval = 16
+        if self.settings.far_cloud_interval and self._far_from_orb():
+            interval = self.settings.far_cloud_interval + 1
+        if self._decision is not None and \
+                self._decision.interval != interval:
+            self._decision.cancel()
+            self._decision = None
+        if self._decision is None:
+            self._decision = self.timers.every(interval, self._decide)
+
+    def _far_from_orb(self):
+        x, y = self.rect.center
+        ox, oy = self.orb.rect.center
+        return (x - ox) ** 2 + (y - oy) ** 2 > \
+            self.settings.far_cloud_distance ** 2
+
+    def update(self, dt):
+        """Moves this cloud the way its last decision said"""
+        step = self.speed * dt
         if self.foo > 80 and self.rect.right < self.settings.screen_width:
-            self.x += self.settings.cloud_speed
+            self.x += step
         elif self.foo > 60 and self.rect.left > 0:
-            self.x -= self.settings.cloud_speed
+            self.x -= step
         elif self.foo > 40 and self.rect.top > 0:
-            self.y -= self.settings.cloud_speed
+            self.y -= step
         elif self.foo > 20 and self.rect.bottom < self.settings.screen_height:
-            self.y += self.settings.cloud_speed
+            self.y += step
         else:
             direction = self._calculate_proj_vector()
-            self.x += direction[0]
-            self.y += direction[1]
+            self.x += direction[0] * dt
+            self.y += direction[1] * dt
         self.rect.x = self.x
         self.rect.y = self.y
 
 
 class Red(Enemy):
-    def __init__(self, fof_game):
-        """Initializes cloud object"""
-        super().__init__(fof_game)
+    """
+    === Public Attributes ===
+    image: current frame of the spin
+    direction: velocity of the next dash (pixels per second)
+    dashing: True iff the red is dashing (only without the store)
+    spin: playback position in the shared spin animation
+    """
+    __slots__ = ('direction', 'dashing', 'spin', '_dash')
+    kind = RED
 
-        self.speed = self.settings.red_speed
-        self.last_moved = 0
+    @classmethod
+    def shared_state(cls, fof_game):
+        state = super().shared_state(fof_game)
+        state.update(animation=fof_game.assets.animation('red'))
+        return state
+
+    @property
+    def speed(self):
+        return self.settings.red_speed
+
+    @property
+    def image(self):
+        return self.spin.image
+
+    def __init__(self, position=None):
+        """Initializes cloud object"""
+        super().__init__()
         self.hp = 20
         self.direction = (0, 0)
+        self.dashing = False
+        self._dash = None
 
-        image = pygame.image.load('images/red.bmp')
-        self.image = \
-            pygame.transform.smoothscale(image, (int(150 * self.sr),
-                                                 int(150 * self.sr)))
+        self.assets.count_spawn('red')
+        self.spin = Animator(self.animation)
         self.rect = self.image.get_rect()
-        self.last_rotated = 0
 
-        self.spawn()
+        self.spawn(position)
 
-    def update(self):
-        """Updates movement for this cloud (Decides which direction to go)."""
-        now = pygame.time.get_ticks()
-        # Makes a chance decision every 15 ms (20% chance of moving towards orb)
-        if now - self.last_moved > 1000:
-            self.direction = self._calculate_proj_vector()
-            self.last_moved = now
-        if 150 < now - self.last_moved < 300:
-            self.x += self.direction[0]
-            self.y += self.direction[1]
+    def _enter_play(self):
+        super()._enter_play()
+        self.spin.play(self.timers)
+
+    def _leave_play(self):
+        super()._leave_play()
+        self.spin.stop()
+        if self._dash is not None:
+            self._dash.cancel()
+            self._dash = None
+        self.dashing = False
+
+    def _decide(self):
+        # Picks a direction every second and dashes 150 to 300 ms later
+        self.direction = self._calculate_proj_vector()
+        self._dash = self.timers.schedule(151, self._start_dash)
+        if self._decision is None:
+            self._decision = self.timers.every(1001, self._decide)
+
+    def _start_dash(self):
+        self.dashing = True
+        self._dash = self.timers.schedule(149, self._end_dash)
+
+    def _end_dash(self):
+        self.dashing = False
+        self._dash = None
+
+    def update(self, dt):
+        """Moves this red along its dash, if it is dashing"""
+        if self.dashing:
+            self.x += self.direction[0] * dt
+            self.y += self.direction[1] * dt
         self.rect.x = self.x
         self.rect.y = self.y
-        if now - self.last_rotated > 150:
-            self.image = pygame.transform.rotate(self.image, 90)
-            self.last_rotated = now
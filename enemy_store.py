@@ -0,0 +1,271 @@
+try:
+    import numpy as np
+except ImportError:  # The batched store is optional; enemies update themselves
+    np = None
+
+CLOUD = 0
+RED = 1
+
+# What a Red's next event is
+_START_DASH = 0
+_END_DASH = 1
+_DECIDE = 2
+
+
+class StoredField:
+    """Enemy attribute that lives in the EnemyStore array of the same name
+    while the enemy is registered there, and on the enemy itself otherwise"""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.private = '_' + name
+
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        if enemy.slot is None:
+            return getattr(enemy, self.private)
+        return getattr(enemy.store, self.name)[enemy.slot].item()
+
+    def __set__(self, enemy, value):
+        if enemy.slot is None:
+            setattr(enemy, self.private, value)
+        else:
+            getattr(enemy.store, self.name)[enemy.slot] = value
+
+
+def _rect_coord(values):
+    """Rounds positions the way pygame.Rect does (half away from zero)"""
+    return np.trunc(values + np.copysign(0.5, values)).astype(np.int64)
+
+
+class EnemyStore:
+    """Structure-of-arrays store for every live enemy. Clouds' random walk
+    and Reds' dashes are computed for all enemies at once with NumPy, then
+    the sprites' rects are synced for drawing and collisions. Decisions
+    wait on the game's TimerWheel: the store sleeps until the earliest
+    enemy is due, then only the due rows decide.
+
+    Enemies register themselves when added to a group and leave when they
+    are removed from their last one. The first count entries of every array
+    are live; removing an enemy moves the last one into its slot.
+
+    === Public Attributes ===
+    count: number of registered enemies
+    x, y: float positions of the top left corners
+    vx, vy: dash velocity of Reds (pixels per second)
+    w, h: rect sizes
+    speed: speed of each enemy (pixels per second)
+    hp: remaining health
+    timer: time (ms) of each enemy's last movement decision
+    due: time (ms) of each enemy's next decision (or dash start or end)
+    phase: what each Red does when due: start, end or decide on a dash
+    dashing: True iff the Red is dashing
+    choice: last random-walk roll of each Cloud (0 to 100)
+    kind: CLOUD or RED
+    sprites: the enemy registered in each slot
+    """
+    count: int
+
+    available = np is not None
+
+    _FIELDS = (('x', 'float64'), ('y', 'float64'), ('vx', 'float64'),
+               ('vy', 'float64'), ('w', 'int64'), ('h', 'int64'),
+               ('speed', 'float64'), ('hp', 'int64'), ('timer', 'float64'),
+               ('due', 'float64'), ('phase', 'int8'), ('dashing', 'bool'),
+               ('choice', 'int64'), ('kind', 'int8'))
+
+    def __init__(self, fof_game, capacity=256):
+        self.settings = fof_game.settings
+        self.orb = fof_game.orb
+        self.game_clock = fof_game.game_clock
+        self.timers = fof_game.timers
+        self.flow_field = fof_game.flow_field
+        # Seeded from the game's RNG so headless runs stay reproducible
+        self.rng = np.random.default_rng(fof_game.rng.getrandbits(64))
+        self.count = 0
+        self.sprites = []
+        # Wheel timer set for the earliest due enemy, and whether it fired
+        self._wake = None
+        self._woken = False
+        for name, dtype in self._FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self):
+        return self.count
+
+    def _grow(self):
+        capacity = 2 * len(self.x)
+        for name, _ in self._FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def add(self, enemy):
+        """Registers enemy, moving its state into the arrays"""
+        if self.count == len(self.x):
+            self._grow()
+        i = self.count
+        self.x[i] = enemy._x
+        self.y[i] = enemy._y
+        self.hp[i] = enemy._hp
+        self.w[i] = enemy.rect.width
+        self.h[i] = enemy.rect.height
+        self.speed[i] = enemy.speed
+        self.timer[i] = enemy.last_moved
+        self.dashing[i] = False
+        if enemy.kind == RED:
+            self.vx[i], self.vy[i] = enemy.direction
+            self.choice[i] = 0
+            self.phase[i] = _START_DASH
+            self.due[i] = enemy.last_moved + 151
+        else:
+            self.vx[i] = self.vy[i] = 0.0
+            self.choice[i] = enemy.foo
+            self.due[i] = enemy.last_moved + 16
+        self.kind[i] = enemy.kind
+        self.sprites.append(enemy)
+        self.count += 1
+        enemy.slot = i
+        self._wake_at(self.due[i])
+
+    def remove(self, enemy):
+        """Unregisters enemy, moving its state back onto the sprite"""
+        i = enemy.slot
+        enemy.slot = None
+        enemy._x = float(self.x[i])
+        enemy._y = float(self.y[i])
+        enemy._hp = int(self.hp[i])
+        last = self.count - 1
+        if i != last:
+            for name, _ in self._FIELDS:
+                array = getattr(self, name)
+                array[i] = array[last]
+            moved = self.sprites[last]
+            self.sprites[i] = moved
+            moved.slot = i
+        self.sprites.pop()
+        self.count = last
+
+    def update(self, dt):
+        """Moves every enemy for a simulation step of dt seconds"""
+        n = self.count
+        if not n:
+            return
+        x, y = self.x[:n], self.y[:n]
+        w, h = self.w[:n], self.h[:n]
+        speed = self.speed[:n]
+        cloud = self.kind[:n] == CLOUD
+        # Rect positions after the previous step, as the sprites see them
+        rx, ry = _rect_coord(x), _rect_coord(y)
+        tx, ty = self._towards_orb(rx, ry, w, h, speed)
+        if self._woken:
+            self._woken = False
+            self._decide(rx, ry, w, h, tx, ty)
+
+        choice = self.choice[:n]
+        step = speed * dt
+        rest = cloud.copy()
+        right = rest & (choice > 80) & (rx + w < self.settings.screen_width)
+        rest &= ~right
+        left = rest & (choice > 60) & (rx > 0)
+        rest &= ~left
+        up = rest & (choice > 40) & (ry > 0)
+        rest &= ~up
+        down = rest & (choice > 20) & (ry + h < self.settings.screen_height)
+        rest &= ~down
+
+        vx, vy, dashing = self.vx[:n], self.vy[:n], self.dashing[:n]
+        x += (np.where(right, step, 0.0) - np.where(left, step, 0.0)
+              + np.where(rest, tx * dt, 0.0) + np.where(dashing, vx * dt, 0.0))
+        y += (np.where(down, step, 0.0) - np.where(up, step, 0.0)
+              + np.where(rest, ty * dt, 0.0) + np.where(dashing, vy * dt, 0.0))
+        self._sync()
+
+    def _decide(self, rx, ry, w, h, tx, ty):
+        """Makes the movement decisions of every enemy that is due, given
+        the rect positions and sizes and the velocities towards the orb"""
+        n = self.count
+        now = self.timers.time
+        timer, due, phase = self.timer[:n], self.due[:n], self.phase[:n]
+        ready = due <= now
+        cloud = self.kind[:n] == CLOUD
+
+        # Clouds roll every 15 ms (20% chance of moving towards orb), far
+        # ones every far_cloud_interval ms while it is set
+        rolls = np.flatnonzero(ready & cloud)
+        if len(rolls):
+            self.choice[rolls] = self.rng.integers(0, 101, len(rolls))
+            timer[rolls] = now
+            interval = 16
+            if self.settings.far_cloud_interval:
+                ox, oy = self.orb.rect.center
+                far = ((rx[rolls] + w[rolls] // 2 - ox) ** 2 +
+                       (ry[rolls] + h[rolls] // 2 - oy) ** 2 >
+                       self.settings.far_cloud_distance ** 2)
+                interval = np.where(
+                    far, self.settings.far_cloud_interval + 1, 16)
+            due[rolls] = now + interval
+
+        # Reds pick a direction every second and dash 150 to 300 ms later;
+        # one step can pass several of these events
+        red = ~cloud
+        reds = np.flatnonzero(ready & red)
+        while len(reds):
+            start = reds[phase[reds] == _START_DASH]
+            end = reds[phase[reds] == _END_DASH]
+            decide = reds[phase[reds] == _DECIDE]
+            self.dashing[start] = True
+            phase[start] = _END_DASH
+            due[start] = timer[start] + 300
+            self.dashing[end] = False
+            phase[end] = _DECIDE
+            due[end] = timer[end] + 1001
+            self.vx[decide] = tx[decide]
+            self.vy[decide] = ty[decide]
+            timer[decide] = now
+            phase[decide] = _START_DASH
+            due[decide] = now + 151
+            reds = reds[due[reds] <= now]
+        self._wake_at(due.min())
+
+    def _wake_at(self, time):
+        """Makes update decide again once the game reaches time (ms)"""
+        time = int(time)
+        wake = self._wake
+        if wake is not None and wake.active:
+            if wake.due <= time:
+                return
+            wake.cancel()
+        if time <= self.timers.time:
+            self._wake = None
+            self._woken = True
+        else:
+            self._wake = self.timers.schedule(time - self.timers.time,
+                                              self._on_wake)
+
+    def _on_wake(self):
+        self._wake = None
+        self._woken = True
+
+    def _towards_orb(self, rx, ry, w, h, speed):
+        """Vectorized Enemy._calculate_proj_vector for every enemy"""
+        if self.flow_field is not None:
+            ux, uy = self.flow_field.sample_many(rx + w // 2, ry + h // 2)
+            return ux * speed, uy * speed
+        ox, oy = self.orb.rect.center
+        dx = (ox - (rx + w // 2)).astype(np.float64)
+        dy = (oy - (ry + h // 2)).astype(np.float64)
+        # HANDLE ZERO DIVISION ERROR
+        dx[dx == 0] = 0.01
+        scale = speed / np.hypot(dx, dy)
+        return dx * scale, dy * scale
+
+    def _sync(self):
+        """Copies positions to the sprites' rects"""
+        n = self.count
+        xs = _rect_coord(self.x[:n]).tolist()
+        ys = _rect_coord(self.y[:n]).tolist()
+        for sprite, rx, ry in zip(self.sprites, xs, ys):
+            sprite.rect.topleft = (rx, ry)
@@ -1,3 +1,6 @@
+import atexit
+import math
+import os
 import random
 import sys
 import pygame.font
@@ -5,94 +8,146 @@ import pygame.font
 import pygame
 from settings import Settings, Crosshair
 from orb import Orb
-from laser import Laser
+from projectiles import LaserPool
 from enemy import Cloud, Red
-from time import sleep
+from entity import EntityGroup
+from spawn_director import SpawnDirector
 from stats import Stats
 from button import Button
 from hud import HUD
+from assets import Assets
+from spatial_hash import SpatialHash
+from flow_field import FlowField
+from enemy_store import EnemyStore
+from timers import TimerWheel
+from renderer import Renderer, DirtyRectRenderer, ScaledRenderer
+from text_cache import TextCache
+from state import GameState, StateMachine
+from profiler import FrameProfiler
+from game_clock import VirtualClock
+from governor import QualityGovernor
+from inputs import LiveInput, ScriptedInput
+
 
-# TODO Start game with orb in the center
 class FightOrFlight:
     """Managing assets/behaviour
     === Attributes ===
     settings: A Settings object containing all the screen/colour settings
     screen: initial panel containing main screen
     bg_colour: Background colour
+    headless: True iff the game runs without a window
+    timers: the timer wheel every cooldown in the game is scheduled on
+    game_clock: source of game time (ms) for every timer in the game
+    input: source of events and mouse positions
+    rng: random number generator behind every chance decision
+    state: the current scene (menu, playing, paused, dying or game over)
     """
     settings: Settings
     screen: pygame
     bg_colour: tuple[int, int, int]
 
-    def __init__(self):
-        """Creates a FOF game object"""
+    FONT_1 = "assets/Organ.ttf"
+    FONT_2 = "assets/slkscr.ttf"
+
+    def __init__(self, headless=False, seed=None, input_source=None,
+                 game_clock=None, screen_size=None, settings_overrides=None):
+        """Creates a FOF game object. A headless game has no window and
+        reads input_source (a ScriptedInput) instead of the real devices.
+        Games created with the same seed make the same random choices.
+        game_clock and screen_size override the clock and the display size
+        the game would otherwise use, and the settings named in
+        settings_overrides (name: value) are changed before anything reads
+        them."""
+        self.headless = headless
+        if headless:
+            # Must be set before pygame.init to take effect
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
+            os.environ['SDL_AUDIODRIVER'] = 'dummy'
+            self.input = input_source or ScriptedInput()
+        else:
+            self.input = input_source or LiveInput()
+        # Game time only passes while the simulation steps
+        self.game_clock = game_clock or VirtualClock()
+        # Every cooldown in the game waits here
+        self.timers = TimerWheel(self.game_clock)
+        self.rng = random.Random(seed)
         pygame.init()
         self.clock = pygame.time.Clock()
-        self.clock.tick(144)
-        self.settings = Settings()
+        self.settings = Settings(screen_size)
+        for name, value in (settings_overrides or {}).items():
+            if not hasattr(self.settings, name):
+                raise AttributeError(f'Settings has no attribute {name!r}')
+            setattr(self.settings, name, value)
+        # Length (s) of one simulation step, and simulated time owed
+        self.dt = 1 / self.settings.sim_rate
+        self.accumulator = 0.0
         self.stats = Stats(self)
-        self.running = False
-        self.paused = False
+        self.state = StateMachine(GameState.MENU)
+        # What the menu or pause screen last drew, None if it must redraw
+        self._idle_view = None
+        # Copy of the last game frame the death banner is animated over
+        self._death_backdrop = None
         self.options = False
-        self.first_red = False
         # self.sr is display size relative to 2560 * 1440p monitor
         self.sr = self.settings.screen_ratio
         self.screen = pygame.display.set_mode((self.settings.screen_width,
                                                self.settings.screen_height))
+        # Fonts and rendered text are shared by the menu, HUD and banners
+        self.text = TextCache(self.settings.text_cache_size)
         self.hud = HUD(self)
         pygame.display.set_caption('Swarm')
-        bg = pygame.image.load('images/bg.bmp')
-        self.bg = pygame.transform.smoothscale(bg,
-                                               (self.settings.screen_width,
-                                                self.settings.screen_height))
-        pause_img = pygame.image.load('images/paused.bmp')
-        self.pause_img = pygame.transform.smoothscale(pause_img,
-                                                      (int(400 * self.sr),
-                                                       int(208 * self.sr)))
+        # Every sprite image is loaded and scaled once, here
+        self.assets = Assets(self.settings)
+        self.bg = self.assets.get('bg')
+        self.pause_img = self.assets.get('paused')
         self.pause_rect = self.pause_img.get_rect(
             center=(self.settings.screen_width // 2,
                     self.settings.screen_height // 2))
         self.orb = Orb(self)
-        self.lasers = pygame.sprite.Group()
-        self.enemies = pygame.sprite.Group()
-        self.last_cloud_spawn = 0
-        self.last_red_spawn = 0
+        self.lasers = EntityGroup()
+        # Lasers are recycled rather than created for every shot
+        self.laser_pool = LaserPool(self)
+        self.enemies = EntityGroup()
+        # Shared headings towards the orb, rebuilt every step
+        if self.settings.flow_field:
+            self.flow_field = FlowField(self)
+        else:
+            self.flow_field = None
+        # Moves all enemies at once with NumPy, when it is installed
+        if self.settings.batched_enemies and EnemyStore.available:
+            self.enemy_store = EnemyStore(self)
+        else:
+            self.enemy_store = None
+        # Broadphase for laser and orb collisions, rebuilt every step
+        self.enemy_grid = SpatialHash(self.settings.collision_cell_size)
+        # Plans spawn times and places ahead, within the enemy budget
+        self.spawner = SpawnDirector(self)
+        # Enemy types whose instances share this game's state
+        self.Cloud = Cloud.bind(self)
+        self.Red = Red.bind(self)
         self._spawn_enemies()
         self.crosshair = Crosshair(self)
-        self.play_button = None
-        self.options_button = None
-        self.quit_button = None
-
-    def run_game(self) -> None:
-        """MAIN LOOP"""
-        while 1:
-            if self.paused:
-                self._check_events()
-                self.display_pause()
-            elif not self.running:
-                pygame.mouse.set_visible(True)
-                self.start_menu()
-            else:
-                pygame.mouse.set_visible(False)
-                self.screen.fill("black")
-                self._check_events()
-                self.orb.update()
-                self.lasers.update()
-                self.enemies.update()
-                self._spawn_enemies()
-                self.laser_collisions()
-                self.orb_collisions()
-                self._update_screen()
-
-    def start_menu(self):
-        """MAIN METHOD for the start menu. Does not run during game phase."""
-        mouse_pos = pygame.mouse.get_pos()
-        self.screen.blit(self.bg, (0, 0))
-        menu_text = self.get_font_1(int(150 * self.sr)).render("SWARM", True,
-                                                               "#b68f40")
-        menu_rect = menu_text.get_rect(
-            center=(self.settings.screen_width // 2, int(300 * self.sr)))
-
+        # Per-phase frame timings; F3 shows them, profile_dump saves them
+        self.profiler = FrameProfiler(self)
+        if self.settings.profile_dump:
+            atexit.register(self.profiler.dump, self.settings.profile_dump)
+        if self.settings.render_scale < 1 or \
+                self.settings.auto_render_scale or \
+                self.settings.quality_governor:
+            self.renderer = ScaledRenderer(self)
+        elif self.settings.dirty_rects:
+            self.renderer = DirtyRectRenderer(self)
+        else:
+            self.renderer = Renderer(self)
+        # Gives up detail while frames are slower than target_fps
+        if self.settings.quality_governor:
+            self.governor = QualityGovernor(self)
+            if self.settings.governor_log:
+                atexit.register(self.governor.dump,
+                                self.settings.governor_log)
+        else:
+            self.governor = None
+        # Menu buttons render both of their colours once, here
         self.play_button = Button(None, (self.settings.screen_width // 2,
                                          int(700 * self.sr)), "PLAY",
                                   self.get_font_1(75), "#d7fcd4", "White")
@@ -102,34 +157,144 @@ class FightOrFlight:
         self.quit_button = Button(None, (self.settings.screen_width // 2,
                                          int(1100 * self.sr)), "QUIT",
                                   self.get_font_1(75), "#d7fcd4", "White")
-        self.screen.blit(menu_text, menu_rect)
 
-        for button in [self.play_button, self.options_button, self.quit_button]:
-            button.changeColor(mouse_pos)
-            button.update(self.screen)
+    def run_game(self) -> None:
+        """MAIN LOOP"""
+        while 1:
+            if self.state.current in (GameState.PLAYING, GameState.DYING):
+                # Caps the render rate; returns real time since last frame
+                frame_time = self.clock.tick(self.settings.render_fps) / 1000
+            else:
+                # Nothing moves in the menu, pause or game over screens: sleep
+                # until there is input, and redraw at most idle_fps times a
+                # second
+                self.input.wait(self.settings.idle_timeout)
+                frame_time = self.clock.tick(self.settings.idle_fps) / 1000
+            self.run_frame(frame_time)
+
+    def run_frame(self, frame_time, render=True):
+        """Runs one pass of the main loop, frame_time seconds after the
+        previous one. Drawing of the game phase is skipped unless render."""
+        self.state.tick(frame_time)
+        state = self.state.current
+        if state is GameState.PAUSED:
+            self._check_events()
+            self.display_pause()
+            self.renderer.invalidate()
+        elif state is GameState.MENU:
+            pygame.mouse.set_visible(True)
+            self.start_menu()
+            self.renderer.invalidate()
+        elif state is GameState.DYING:
+            self._check_events_idle()
+            self.display_death()
+            if self.state.elapsed >= self.settings.death_time:
+                self._end_game()
+        elif state is GameState.GAME_OVER:
+            pygame.mouse.set_visible(True)
+            self.display_game_over()
+            self.renderer.invalidate()
+        else:
+            pygame.mouse.set_visible(False)
+            self._idle_view = None
+            self.profiler.begin_frame(frame_time)
+            self._check_events()
+            self.profiler.mark('events')
+            # Simulates as many fixed steps as real time has passed
+            self.accumulator += min(frame_time, self.settings.max_frame_time)
+            while self.accumulator >= self.dt and \
+                    self.state.current is GameState.PLAYING:
+                self._step(self.dt)
+                self.accumulator -= self.dt
+            if render:
+                self._update_screen()
+            else:
+                self.renderer.invalidate()
+            self.profiler.mark('render')
+            self.profiler.end_frame(len(self.enemies), len(self.lasers))
+            self.renderer.frame_done(self.profiler.last('work'))
+            if self.governor is not None:
+                self.governor.frame_done(self.profiler.last('work'),
+                                         len(self.enemies))
+            self.assets.end_frame()
+        self.input.next_frame(frame_time)
+
+    def _step(self, dt):
+        """Advances the simulation by one fixed step of dt seconds"""
+        profiler = self.profiler
+        self.game_clock.advance(dt)
+        self.timers.advance()
+        profiler.mark('timers')
+        self.orb.update(dt)
+        profiler.mark('orb')
+        self.lasers.update(dt)
+        profiler.mark('lasers')
+        self._update_enemies(dt)
+        profiler.mark('enemies')
+        self._spawn_enemies()
+        profiler.mark('spawn')
+        self._update_broadphase()
+        profiler.mark('broadphase')
+        self.laser_collisions()
+        profiler.mark('laser_collisions')
+        self.orb_collisions()
+        profiler.mark('orb_collisions')
+
+    def _update_enemies(self, dt):
+        """Moves every enemy, in one batch when the store is enabled"""
+        if self.flow_field is not None:
+            self.flow_field.update()
+        if self.enemy_store is not None:
+            self.enemy_store.update(dt)
+        else:
+            self.enemies.update(dt)
+
+    def _update_broadphase(self):
+        """Rebuilds the spatial hash both collision passes query"""
+        self.enemy_grid.build(self.enemies)
+
+    def start_menu(self):
+        """MAIN METHOD for the start menu. Does not run during game phase."""
+        mouse_pos = self.input.get_mouse_pos()
+        buttons = [self.play_button, self.options_button, self.quit_button]
+        # Only redraw when the screen changed or a button's hover state did
+        view = ('menu',) + tuple(button.checkForInput(mouse_pos)
+                                 for button in buttons)
+        if view != self._idle_view:
+            self.screen.blit(self.bg, (0, 0))
+            menu_text = self.text.render(self.FONT_1, int(150 * self.sr),
+                                         "SWARM", "#b68f40")
+            menu_rect = menu_text.get_rect(
+                center=(self.settings.screen_width // 2, int(300 * self.sr)))
+            self.screen.blit(menu_text, menu_rect)
+
+            for button in buttons:
+                button.changeColor(mouse_pos)
+                button.update(self.screen)
+            pygame.display.update()
+            self._idle_view = view
         self.check_events_menu(mouse_pos)
 
     def check_events_menu(self, mouse_pos):
         """Method to check any events happening in the main menu.
         Does not run during game phase."""
-        for event in pygame.event.get():
+        for event in self.input.get_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if self.play_button.checkForInput(mouse_pos):
-                    self.running = True
-                    self.reset_game()
+                    self.start_game()
                 if self.options_button.checkForInput(mouse_pos):
                     self.options = True
                 if self.quit_button.checkForInput(mouse_pos):
                     pygame.quit()
                     sys.exit()
-        pygame.display.update()
+            self._check_expose(event)
 
     def _check_events(self):
         """Respond to keypresses and mouse events"""
-        for event in pygame.event.get():
+        for event in self.input.get_events():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -139,33 +304,57 @@ class FightOrFlight:
                 self._check_keyup_events(event)
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 self._check_mouse_events(event)
+            else:
+                self._check_expose(event)
+
+    def _check_events_idle(self):
+        """Handles events on screens that ignore gameplay input"""
+        for event in self.input.get_events():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            self._check_expose(event)
+
+    def _check_expose(self, event):
+        """Forces the menu or pause screen to be redrawn once the window
+        contents are lost"""
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self._idle_view = None
 
     def _spawn_enemies(self):
         """Spawns enemies over a given time period"""
-        cd_cloud = random.randint(self.settings.cloud_cooldown_min,
-                                  self.settings.cloud_cooldown)
-        cd_red = random.randint(self.settings.red_cooldown_min,
-                                self.settings.red_cooldown)
-        now = pygame.time.get_ticks()
-        if now - self.last_cloud_spawn > cd_cloud \
-                and len(self.enemies) < self.settings.max_enemies:
-            enemy = Cloud(self)
-            self.enemies.add(enemy)
-            self.last_cloud_spawn = now
-        if not self.first_red and self.stats.score >= 690:
-            self.enemies.add(Red(self))
-            self.last_red_spawn = now
-            self.first_red = True
-        if now - self.last_red_spawn > cd_red:
-            self.enemies.add(Red(self))
-            self.last_red_spawn = now
+        self.spawner.update()
 
     def laser_collisions(self):
         """Tracks when any object from the laser group intereacts with an object
         of the enemy group"""
-        collisions = pygame.sprite.groupcollide(self.enemies, self.lasers,
-                                                False, True)
-        for enemy in collisions:
+        # Same result as pygame.sprite.groupcollide(enemies, lasers, False,
+        # True, collide_mask): a laser touching several enemies goes to the
+        # first of them in group order, and each enemy loses one hp however
+        # many lasers hit it. Masks are only compared once rects overlap.
+        # Swept lasers also touch what they passed through during the step,
+        # and go to the enemy they reached first.
+        hit = {}
+        swept = self.settings.swept_lasers
+        dt = self.dt
+        for laser in self.lasers.sprites():
+            rect = laser.rect
+            if swept:
+                area = rect.union(rect.move(-int(laser.direction[0] * dt),
+                                            -int(laser.direction[1] * dt)))
+                target = self._swept_target(laser, [
+                    enemy for enemy in self.enemy_grid.query(area)
+                    if enemy.rect.colliderect(area)])
+            else:
+                target = None
+                for enemy in self.enemy_grid.query(rect):
+                    if self._laser_touches(enemy, laser):
+                        target = enemy
+                        break
+            if target is not None:
+                hit[target] = True
+                laser.kill()
+        for enemy in hit:
             # Deduct one health point
             enemy.hp -= 1
             if enemy.hp <= 0:
@@ -175,57 +364,169 @@ class FightOrFlight:
                     self.stats.score += 500
                 enemy.kill()
                 self.hud.update_score()
-        for laser in self.lasers.sprites():
-            if -20 > laser.x > self.settings.screen_width + 50 or \
-                    -10 > laser.y > self.settings.screen_height:
-                laser.kill()
+
+    def _laser_touches(self, enemy, laser):
+        """True iff the laser touches enemy where it is now"""
+        return enemy.rect.colliderect(laser.rect) and \
+            self._pixels_touch(enemy, laser)
+
+    def _swept_target(self, laser, candidates):
+        """The enemy among candidates that the laser reached first during
+        the last step, or None if it touched none of them"""
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            enemy = candidates[0]
+            # Most hits are where the laser ends, which is cheapest to test
+            if self._laser_touches(enemy, laser) or \
+                    self._passed_through(enemy, laser) is not None:
+                return enemy
+            return None
+        start, end = laser.path(self.dt)
+        w, h = laser.rect.size
+        length = math.hypot(end[0] - start[0], end[1] - start[1])
+        # A laser cannot touch an enemy before its path enters the enemy's
+        # grown rect, so enemies are tried in the order it enters them
+        entries = []
+        for i, enemy in enumerate(candidates):
+            clipped = enemy.rect.inflate(w, h).clipline(start, end)
+            entry = length
+            if clipped:
+                x, y = clipped[0]
+                entry = math.hypot(x - start[0], y - start[1])
+            entries.append((entry, i, enemy))
+        entries.sort()
+        target = None
+        nearest = None
+        # Ties go to the enemy entered first, then to group order
+        for entry, _, enemy in entries:
+            if nearest is not None and entry >= nearest:
+                break
+            distance = self._passed_through(enemy, laser, nearest)
+            if distance is None and nearest is None and \
+                    self._laser_touches(enemy, laser):
+                distance = length
+            if distance is not None and (nearest is None or
+                                         distance < nearest):
+                target, nearest = enemy, distance
+        return target
+
+    def _passed_through(self, enemy, laser, before=None):
+        """How far (px) along its path over the last step the laser first
+        touched enemy, or None if it did not (or not until before px). Its
+        centre's path is clipped to the enemy's rect grown by half the
+        laser's size, where the rects overlap, and masks are compared at
+        points along that stretch."""
+        start, end = laser.path(self.dt)
+        w, h = laser.rect.size
+        clipped = enemy.rect.inflate(w, h).clipline(start, end)
+        if not clipped:
+            return None
+        (x1, y1), (x2, y2) = clipped
+        dx, dy = x2 - x1, y2 - y1
+        # Samples closer than the laser is thick leave no gaps between them
+        samples = int(math.hypot(dx, dy) // max(1, min(w, h) // 2)) + 1
+        enemy_mask = self.assets.mask(enemy.image)
+        laser_mask = self.assets.mask(laser.image)
+        left = enemy.rect.x + w // 2
+        top = enemy.rect.y + h // 2
+        for i in range(samples + 1):
+            x = x1 + dx * i // samples
+            y = y1 + dy * i // samples
+            distance = math.hypot(x - start[0], y - start[1])
+            if before is not None and distance >= before:
+                return None
+            if enemy_mask.overlap(laser_mask, (x - left, y - top)) is not None:
+                return distance
+        return None
 
     def orb_collisions(self):
         """Tracks if any enemies touch the orb"""
-        for enemy in self.enemies:
-            # Ratio 0.6 because orb rect is much larger
-            if pygame.sprite.collide_rect_ratio(0.60)(self.orb, enemy):
-                death_text = \
-                    self.get_font_1(int(150 * self.sr)).render("DEATH", True,
-                                                               "red")
-                death_rect = death_text.get_rect(
-                    center=(self.settings.screen_width // 2,
-                            self.settings.screen_height // 2))
-                self.screen.blit(death_text, death_rect)
-                # Updates only the death rectangle of the display
-                pygame.display.update(death_rect)
-                # Pauses game for 1.5 seconds
-                sleep(1.5)
-                self.enemies.empty()
-                self.stats.reset()
-                self.orb.reset_movement()
-                self.running = False
+        orb = self.orb
+        for enemy in self.enemy_grid.query(orb.rect):
+            # Enemies shot down this step are still in the grid
+            if not enemy.alive():
+                continue
+            if orb.rect.colliderect(enemy.rect) and \
+                    self._pixels_touch(orb, enemy):
+                # The scene freezes while the death banner plays out
+                self.state.change(GameState.DYING)
+                # The orb can only die once
+                break
+
+    def display_death(self):
+        """Zooms the DEATH banner in over the frozen last game frame"""
+        if self._death_backdrop is None:
+            self._death_backdrop = self.screen.copy()
+        centre = (self.settings.screen_width // 2,
+                  self.settings.screen_height // 2)
+        full_size = int(150 * self.sr)
+        # Area of the banner at full size, the largest it gets
+        area = self.text.render(self.FONT_1, full_size, "DEATH",
+                                "red").get_rect(center=centre)
+        progress = min(1.0, self.state.elapsed / self.settings.death_zoom_time)
+        # Sizes are rounded to 4 px so the text cache holds few of them
+        size = max(4, int(full_size * (0.5 + 0.5 * progress)) // 4 * 4)
+        death_text = self.text.render(self.FONT_1, size, "DEATH", "red")
+        self.screen.blit(self._death_backdrop, area, area)
+        self.screen.blit(death_text, death_text.get_rect(center=centre))
+        # Updates only the death rectangle of the display
+        pygame.display.update(area)
+
+    def _end_game(self):
+        """Clears the finished game, once, and shows the game over screen"""
+        self.enemies.empty()
+        self.laser_pool.clear()
+        self.stats.reset()
+        self.orb.reset_movement()
+        self._death_backdrop = None
+        self._idle_view = None
+        self.state.change(GameState.GAME_OVER)
+
+    def display_game_over(self):
+        """Shows the final score until a click, a key press or
+        settings.game_over_time ms, then returns to the menu"""
+        if self._idle_view != ('game over',):
+            self.screen.blit(self.bg, (0, 0))
+            centre_x = self.settings.screen_width // 2
+            title = self.text.render(self.FONT_1, int(150 * self.sr),
+                                     "GAME OVER", "red")
+            self.screen.blit(title, title.get_rect(
+                center=(centre_x, int(500 * self.sr))))
+            score = self.text.render(self.FONT_2, int(75 * self.sr),
+                                     f"SCORE {self.stats.last_score}",
+                                     "White")
+            self.screen.blit(score, score.get_rect(
+                center=(centre_x, int(800 * self.sr))))
+            pygame.display.update()
+            self._idle_view = ('game over',)
+        done = self.state.elapsed >= self.settings.game_over_time
+        for event in self.input.get_events():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+            if event.type in (pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN):
+                done = True
+            self._check_expose(event)
+        if done:
+            self._idle_view = None
+            self.state.change(GameState.MENU)
+
+    def _pixels_touch(self, a, b):
+        """Narrow phase for two sprites whose rects overlap: True iff their
+        current images share an opaque pixel"""
+        offset = (b.rect.x - a.rect.x, b.rect.y - a.rect.y)
+        return self.assets.mask(a.image).overlap(
+            self.assets.mask(b.image), offset) is not None
 
     def _update_screen(self):
         """Updates images to the screen"""
-        # Fill in display colour after each pass of the loop
         self.crosshair.update_crosshair()
-        # Blit background photo onto display screen
-        self.screen.blit(self.bg, (0, 0))
-        self.orb.blitme()
-
-        # pygame.draw.rect(self.screen, (0, 255, 255), self.hud.score_rect)
-        # Draws lasers and enemies (if any)
-        self.lasers.draw(self.screen)
-        self.enemies.draw(self.screen)
-        self.hud.show_score()
-        # Makes recently created screen visible
-        # pygame.draw.rect(self.screen, (0, 0, 255), self.orb.rect)
-        self.crosshair.blitme()
-        # pygame.draw.rect(self.screen, (0, 0, 255), self.crosshair.rect)
-        pygame.display.flip()
+        self.renderer.draw()
 
     def _check_mouse_events(self, event):
-        if event.button == 1 and self.running:
+        if event.button == 1 and self.state.current is GameState.PLAYING:
             self._fire_bullet()
-        elif not self.running:
-            if self.play_button.rect.collidepoint(pygame.mouse.get_pos()):
-                self.running = True
 
     def _check_keydown_events(self, event):
         """Private method to check which keys have been pressed"""
@@ -247,15 +548,20 @@ class FightOrFlight:
             # self.orb.last_pressed.append(4)
         elif event.key == pygame.K_SPACE:
             self.orb.blink()
-        elif event.key == pygame.K_k:
+        elif event.key == pygame.K_k and \
+                self.state.current is GameState.PLAYING:
             self._fire_bullet()
+        elif event.key == pygame.K_F3:
+            self.profiler.overlay = not self.profiler.overlay
         elif event.key == pygame.K_ESCAPE:
-            self.paused = not self.paused
+            if self.state.current is GameState.PLAYING:
+                self.state.change(GameState.PAUSED)
+            else:
+                self.state.change(GameState.PLAYING)
 
     def _fire_bullet(self):
         """Instantiates a laser object and adds it to the laser group"""
-        new_laser = Laser(self)
-        self.lasers.add(new_laser)
+        self.laser_pool.fire()
 
     def _check_keyup_events(self, event):
         """Checks when player releases any keys"""
@@ -276,24 +582,30 @@ class FightOrFlight:
             # self.orb.last_pressed.remove(4)
 
     def display_pause(self):
-        self.screen.blit(self.pause_img, self.pause_rect)
-        pygame.display.update(self.pause_rect)
+        """Draws the pause banner over the last game frame, once"""
+        if self._idle_view != ('pause',):
+            self.screen.blit(self.pause_img, self.pause_rect)
+            pygame.display.update(self.pause_rect)
+            self._idle_view = ('pause',)
+
+    def start_game(self):
+        """Leaves the menu and starts a fresh game"""
+        self.reset_game()
+        self.state.change(GameState.PLAYING)
 
     def reset_game(self):
-        self.orb.rect.center = (self.settings.screen_width // 2,
-                                self.settings.screen_height // 2)
+        self.orb.reset_movement()
         self.stats.reset()
-        self.clock = pygame.time.Clock()
-        self.clock.tick(144)
-        self.first_red = False
+        self.accumulator = 0.0
+        self.spawner.reset()
 
     def get_font_1(self, size):
         """Alien space theme font"""
-        return pygame.font.Font("assets/Organ.ttf", size)
+        return self.text.font(self.FONT_1, size)
 
     def get_font_2(self, size):
         """Alien space theme font"""
-        return pygame.font.Font("assets/slkscr.ttf", size)
+        return self.text.font(self.FONT_2, size)
 
 
 if __name__ == "__main__":
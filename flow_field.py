@@ -0,0 +1,106 @@
+import math
+
+from enemy_store import np
+
+
+class FlowField:
+    """Coarse grid of unit vectors pointing from each cell towards the orb,
+    rebuilt once per simulation step so that every enemy can look its
+    heading up instead of working it out. Positions off the grid use the
+    nearest edge cell.
+
+    Cells next to the orb's are too coarse to aim with, so enemies there
+    get their exact heading instead.
+
+    === Public Attributes ===
+    cell_size: side (px) of a grid cell
+    cols, rows: size of the grid
+    ux, uy: unit vector of each cell, row by row (None around the orb)
+    """
+    cell_size: int
+    cols: int
+    rows: int
+    ux: list[float | None]
+    uy: list[float | None]
+
+    def __init__(self, fof_game):
+        settings = fof_game.settings
+        self.orb = fof_game.orb
+        self.cell_size = settings.flow_cell_size
+        self.cols = settings.screen_width // self.cell_size + 1
+        self.rows = settings.screen_height // self.cell_size + 1
+        self.ux = [0.0] * (self.cols * self.rows)
+        self.uy = [0.0] * (self.cols * self.rows)
+        self._orb = (0, 0)
+        # NumPy copies of ux and uy for EnemyStore, made when first needed
+        self._arrays = None
+
+    def update(self):
+        """Points every cell at the orb's current centre"""
+        ox, oy = self.orb.rect.center
+        self._orb = (ox, oy)
+        orb_col, orb_row = self._cell(ox, oy)
+        half = self.cell_size / 2
+        i = 0
+        for row in range(self.rows):
+            dy = oy - (row * self.cell_size + half)
+            for col in range(self.cols):
+                if abs(col - orb_col) <= 1 and abs(row - orb_row) <= 1:
+                    # Marks the cells where sample aims exactly
+                    self.ux[i] = self.uy[i] = None
+                else:
+                    dx = ox - (col * self.cell_size + half)
+                    length = math.hypot(dx, dy)
+                    self.ux[i] = dx / length
+                    self.uy[i] = dy / length
+                i += 1
+        self._arrays = None
+
+    def _cell(self, x, y):
+        col = min(max(int(x // self.cell_size), 0), self.cols - 1)
+        row = min(max(int(y // self.cell_size), 0), self.rows - 1)
+        return col, row
+
+    def sample(self, x, y):
+        """Unit vector towards the orb from the point (x, y)"""
+        # Inlined _cell: this runs for every enemy that steers
+        size = self.cell_size
+        col = int(x // size)
+        if col < 0:
+            col = 0
+        elif col >= self.cols:
+            col = self.cols - 1
+        row = int(y // size)
+        if row < 0:
+            row = 0
+        elif row >= self.rows:
+            row = self.rows - 1
+        i = row * self.cols + col
+        ux = self.ux[i]
+        if ux is None:
+            dx = self._orb[0] - x
+            dy = self._orb[1] - y
+            length = math.hypot(dx, dy) or 1.0
+            return dx / length, dy / length
+        return ux, self.uy[i]
+
+    def sample_many(self, x, y):
+        """sample for arrays of points (needs NumPy)"""
+        if self._arrays is None:
+            # Cells marked None become NaN
+            self._arrays = (np.array(self.ux, dtype=np.float64),
+                            np.array(self.uy, dtype=np.float64))
+        field_x, field_y = self._arrays
+        col = np.clip(x // self.cell_size, 0, self.cols - 1).astype(np.int64)
+        row = np.clip(y // self.cell_size, 0, self.rows - 1).astype(np.int64)
+        i = row * self.cols + col
+        ux, uy = field_x[i], field_y[i]
+        near = np.isnan(ux)
+        if near.any():
+            dx = (self._orb[0] - x[near]).astype(np.float64)
+            dy = (self._orb[1] - y[near]).astype(np.float64)
+            length = np.hypot(dx, dy)
+            length[length == 0] = 1.0
+            ux[near] = dx / length
+            uy[near] = dy / length
+        return ux, uy
@@ -0,0 +1,20 @@
+class VirtualClock:
+    """Game time, moved on by each simulation step. Everything in the game
+    reads this one clock, so all timers see the same time during a step,
+    freeze together while the game is paused and a run does not depend on
+    how fast the machine is.
+
+    === Public Attributes ===
+    ticks: simulated time (ms) since the clock was created
+    """
+    ticks: float
+
+    def __init__(self):
+        self.ticks = 0.0
+
+    def get_ticks(self):
+        return int(self.ticks)
+
+    def advance(self, dt):
+        """Moves time forward by dt seconds"""
+        self.ticks += dt * 1000
@@ -0,0 +1,182 @@
+import csv
+import logging
+import statistics
+
+from enemy_store import RED
+from renderer import ScaledRenderer
+
+logger = logging.getLogger(__name__)
+
+# Levels of detail, in the order they are given up
+LEVERS = ('red_spin', 'cloud_ai', 'render_scale', 'laser_cap')
+
+
+class QualityGovernor:
+    """Holds settings.target_fps as the swarm grows by giving up one level
+    of detail at a time, and takes them back once the swarm has shrunk and
+    frames are fast again. It judges every governor_window game-phase
+    frames on the median work done per frame.
+
+    Levers, in the order they are given up:
+    red_spin: Reds off the screen stop spinning
+    cloud_ai: Clouds far from the orb decide every governor_cloud_interval
+        ms instead of every 15
+    render_scale: the game phase is drawn at render_scale_min (left out
+        while auto_render_scale owns the scale)
+    laser_cap: at most governor_max_lasers lasers are live
+
+    Every decision is logged (to stderr unless the game configures
+    logging), kept in decisions, shown on the profiler overlay and written
+    to settings.governor_log on exit. Decisions depend on real frame times,
+    so a governed run is not reproducible; headless runs leave the governor
+    off.
+
+    Pulling a lever saves the setting it changes, and releasing it puts
+    the saved value back.
+
+    === Public Attributes ===
+    levers: the levers this game can pull, in order
+    level: number of levers currently pulled
+    decisions: every decision so far, oldest first, as dicts
+    """
+    levers: tuple[str, ...]
+    level: int
+    decisions: list[dict]
+
+    def __init__(self, fof_game):
+        self.game = fof_game
+        self.settings = fof_game.settings
+        self.levers = tuple(
+            lever for lever in LEVERS
+            if lever != 'render_scale' or
+            (isinstance(fof_game.renderer, ScaledRenderer) and
+             not self.settings.auto_render_scale))
+        self.level = 0
+        self.decisions = []
+        self._work = []
+        # Enemy count each pulled lever was pulled at
+        self._pulled_at = []
+        # Setting values the pulled levers replaced
+        self._saved = {}
+        self._spin_check = None
+        if not logger.hasHandlers():
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter('%(name)s: %(message)s'))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        if self.settings.dirty_rects:
+            logger.warning('dirty_rects is ignored while the quality '
+                           'governor draws through ScaledRenderer')
+
+    @property
+    def pulled(self):
+        """Levers currently pulled, in the order they were pulled"""
+        return self.levers[:self.level]
+
+    def frame_done(self, work, enemies):
+        """Records the work (ms) of a game-phase frame that ended with
+        enemies alive, and pulls or releases a lever once a window is
+        full"""
+        self._work.append(work)
+        if len(self._work) < self.settings.governor_window:
+            return
+        work = statistics.median(self._work)
+        self._work.clear()
+        budget = 1000 / self.settings.target_fps
+        if work > budget and self.level < len(self.levers):
+            self._pulled_at.append(enemies)
+            self._set(self.levers[self.level], True, work, enemies)
+            self.level += 1
+        elif work < self.settings.governor_release * budget and \
+                self.level and enemies < self._pulled_at[-1]:
+            # Only fewer enemies than when it was pulled make it safe to
+            # take a level back; otherwise the next window would pull it
+            # again
+            self._pulled_at.pop()
+            self.level -= 1
+            self._set(self.levers[self.level], False, work, enemies)
+
+    def _set(self, lever, pulled, work, enemies):
+        getattr(self, '_' + lever)(pulled)
+        decision = {'frame': self.game.profiler.frames,
+                    'time': self.game.game_clock.get_ticks(),
+                    'lever': lever,
+                    'action': 'pull' if pulled else 'release',
+                    'work': round(work, 2),
+                    'enemies': enemies}
+        self.decisions.append(decision)
+        logger.info('frame %(frame)d: %(action)s %(lever)s '
+                    '(work p50 %(work).2f ms, %(enemies)d enemies)', decision)
+
+    def _red_spin(self, pulled):
+        if pulled:
+            self._spin_check = self.game.timers.every(
+                self.settings.governor_spin_check, self._check_spins)
+            self._check_spins()
+        else:
+            self._spin_check.cancel()
+            self._spin_check = None
+            for red in self._reds():
+                red.spin.play(self.game.timers)
+
+    def _check_spins(self):
+        """Stops the spin of every Red off the screen, restarts the rest"""
+        screen = self.game.screen.get_rect()
+        for red in self._reds():
+            if screen.colliderect(red.rect):
+                red.spin.play(self.game.timers)
+            else:
+                red.spin.stop()
+
+    def _reds(self):
+        return [enemy for enemy in self.game.enemies if enemy.kind == RED]
+
+    def _cloud_ai(self, pulled):
+        if pulled:
+            interval = self._save('far_cloud_interval')
+            self.settings.far_cloud_interval = max(
+                interval or 0, self.settings.governor_cloud_interval)
+        else:
+            self._restore('far_cloud_interval')
+
+    def _render_scale(self, pulled):
+        if pulled:
+            self.game.renderer.set_scale(self.settings.render_scale_min)
+        else:
+            self.game.renderer.set_scale(self.settings.render_scale)
+
+    def _laser_cap(self, pulled):
+        if pulled:
+            cap = min(self._save('max_lasers'),
+                      self.settings.governor_max_lasers)
+            self.settings.max_lasers = cap
+            self.game.laser_pool.trim(cap)
+        else:
+            self._restore('max_lasers')
+
+    def _save(self, name):
+        """Remembers the current value of the setting name, and returns it"""
+        value = self._saved[name] = getattr(self.settings, name)
+        return value
+
+    def _restore(self, name):
+        setattr(self.settings, name, self._saved.pop(name))
+
+    def readout(self):
+        """Lines for the profiler overlay"""
+        lines = [f'quality level {self.level}/{len(self.levers)}: '
+                 + (', '.join(self.pulled) or 'full detail')]
+        if self.decisions:
+            last = self.decisions[-1]
+            lines.append(f'last: frame {last["frame"]} {last["action"]} '
+                         f'{last["lever"]} (work {last["work"]:.1f} ms, '
+                         f'{last["enemies"]} enemies)')
+        return lines
+
+    def dump(self, path):
+        """Writes every decision to path as CSV"""
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=(
+                'frame', 'time', 'lever', 'action', 'work', 'enemies'))
+            writer.writeheader()
+            writer.writerows(self.decisions)
@@ -0,0 +1,109 @@
+"""Runs FightOrFlight without a window, on a virtual clock and a seeded RNG.
+
+A run with the same seed, frame count and script always ends in the same
+score and entity positions, so it can be used for profiling and regression
+checks:
+
+    python headless.py --frames 5000 --seed 7
+"""
+import argparse
+import hashlib
+import json
+import math
+import time
+
+import pygame
+
+from fight_or_flight import FightOrFlight
+from inputs import ScriptedInput
+from state import GameState
+
+
+def orbit_script(frames, centre, radius=300, fire_every=4, period=600):
+    """Returns a script that circles the mouse around centre once every
+    period frames and fires every fire_every frames"""
+    script = {}
+    for frame in range(frames):
+        angle = 2 * math.pi * frame / period
+        entry = {'mouse': (int(centre[0] + radius * math.cos(angle)),
+                           int(centre[1] + radius * math.sin(angle)))}
+        if fire_every and frame % fire_every == 0:
+            entry['events'] = [pygame.event.Event(pygame.MOUSEBUTTONDOWN,
+                                                  button=1,
+                                                  pos=entry['mouse'])]
+        script[frame] = entry
+    return script
+
+
+def make_game(seed=0, script=None, overrides=None):
+    """Creates a headless game that is already in the game phase, with the
+    settings named in overrides (name: value) changed"""
+    game = FightOrFlight(headless=True, seed=seed,
+                         input_source=ScriptedInput(script),
+                         settings_overrides=overrides)
+    game.start_game()
+    return game
+
+
+def snapshot(game):
+    """Returns the state a run is compared on"""
+    return {
+        'alive': game.state.current is GameState.PLAYING,
+        'score': game.stats.score,
+        'orb': (game.orb.x, game.orb.y),
+        'enemies': [(type(enemy).__name__, enemy.x, enemy.y, enemy.hp)
+                    for enemy in game.enemies],
+        'lasers': [(laser.x, laser.y) for laser in game.lasers],
+    }
+
+
+def digest(state):
+    """Short fingerprint of a snapshot, for comparing runs"""
+    return hashlib.sha256(repr(state).encode()).hexdigest()[:16]
+
+
+def run_headless(frames, seed=0, script=None, render=False, overrides=None,
+                 timings=None):
+    """Steps a headless game for frames frames as fast as possible, stopping
+    as soon as the orb dies, and returns its final state. The real time
+    (ms) each frame took is appended to timings, if given."""
+    game = make_game(seed, script, overrides)
+    if game.settings.render_fps:
+        frame_time = 1 / game.settings.render_fps
+    else:
+        frame_time = game.dt
+    played = 0
+    while played < frames and game.state.current is GameState.PLAYING:
+        start = time.perf_counter()
+        game.run_frame(frame_time, render=render)
+        if timings is not None:
+            timings.append((time.perf_counter() - start) * 1000)
+        played += 1
+    state = snapshot(game)
+    state['seed'] = seed
+    state['frames'] = played
+    state['time'] = game.game_clock.get_ticks()
+    return state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=3000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--fire-every', type=int, default=4,
+                        help='frames between shots (0 to never fire)')
+    parser.add_argument('--render', action='store_true',
+                        help='also draw every frame to the dummy display')
+    args = parser.parse_args()
+    # The dummy display of the headless game is 1024 x 768
+    script = orbit_script(args.frames, (512, 384), fire_every=args.fire_every)
+    state = run_headless(args.frames, args.seed, script, args.render)
+    print(json.dumps({'seed': state['seed'], 'frames': state['frames'],
+                      'alive': state['alive'], 'score': state['score'],
+                      'enemies': len(state['enemies']),
+                      'lasers': len(state['lasers']),
+                      'digest': digest(state)}))
+
+
+if __name__ == '__main__':
+    main()
@@ -13,9 +13,9 @@ class HUD:
         self.update_score()
 
     def update_score(self):
-        self.score_text = \
-            self.game.get_font_2(int(50 * self.game.sr)).render(
-                str(self.stats.score), True, "White")
+        self.score_text = self.game.text.render(
+            self.game.FONT_2, int(50 * self.game.sr), str(self.stats.score),
+            "White")
         self.score_rect = \
             self.score_text.get_rect(
                 right=self.settings.screen_width - int(40 * self.game.sr),
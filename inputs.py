@@ -0,0 +1,215 @@
+import struct
+
+import pygame
+
+
+class LiveInput:
+    """Input read from the real keyboard and mouse"""
+
+    def __init__(self):
+        # Event that woke up wait, delivered with the next get_events
+        self._pending = []
+
+    def get_events(self):
+        events = pygame.event.get()
+        if self._pending:
+            events = self._pending + events
+            self._pending = []
+        return events
+
+    def wait(self, timeout):
+        """Sleeps until an event arrives or timeout ms have passed"""
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            self._pending.append(event)
+
+    def get_mouse_pos(self):
+        return pygame.mouse.get_pos()
+
+    def next_frame(self, frame_time):
+        """Live input needs no bookkeeping between frames"""
+
+
+class ScriptedInput:
+    """Input fed from a script instead of the real devices.
+
+    === Public Attributes ===
+    script: maps a frame number to a dict that may hold 'events' (a list of
+        pygame events delivered that frame) and 'mouse' (the mouse position
+        from that frame onwards)
+    frame: number of the current frame
+    mouse_pos: current mouse position
+    """
+    frame: int
+    mouse_pos: tuple[int, int]
+
+    def __init__(self, script=None, mouse_pos=(0, 0)):
+        self.script = script if script is not None else {}
+        self.frame = 0
+        self.mouse_pos = mouse_pos
+        self._events = []
+        self._load_frame()
+
+    def _load_frame(self):
+        entry = self.script.get(self.frame, {})
+        self._events = list(entry.get('events', ()))
+        if 'mouse' in entry:
+            self.mouse_pos = tuple(entry['mouse'])
+
+    def get_events(self):
+        events, self._events = self._events, []
+        return events
+
+    def get_mouse_pos(self):
+        return self.mouse_pos
+
+    def wait(self, timeout):
+        """Scripted input never blocks"""
+
+    def next_frame(self, frame_time):
+        """Moves on to the next frame of the script"""
+        self.frame += 1
+        self._load_frame()
+
+
+# Input log layout (little endian): a header, then for every frame its
+# length (s), the mouse position and the number of events that follow
+LOG_MAGIC = b'SWRM'
+LOG_VERSION = 1
+_HEADER = struct.Struct('<4sHqHH')
+_FRAME = struct.Struct('<dhhH')
+_EVENT = struct.Struct('<Bihh')
+# Events the game reacts to; everything else (including QUIT, which ends
+# the recording) is left out of the log
+LOGGED_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.MOUSEBUTTONDOWN,
+                 pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+
+
+class InputRecorder:
+    """Passes another input source through to the game while writing every
+    frame's events, mouse position and length to a binary log that
+    ReplayInput plays back.
+
+    The mouse is read once per frame, so the game sees exactly the position
+    that is logged.
+
+    === Public Attributes ===
+    source: the input being recorded
+    frames: number of frames written so far
+    """
+    frames: int
+
+    def __init__(self, source, path, seed, screen_size):
+        self.source = source
+        self.frames = 0
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(LOG_MAGIC, LOG_VERSION, seed,
+                                      *screen_size))
+        self._events = []
+        self._mouse_pos = None
+        self._last_mouse_pos = (0, 0)
+
+    def get_events(self):
+        events = self.source.get_events()
+        self._events.extend(event for event in events
+                            if event.type in LOGGED_EVENTS)
+        return events
+
+    def get_mouse_pos(self):
+        if self._mouse_pos is None:
+            self._mouse_pos = tuple(self.source.get_mouse_pos())
+        return self._mouse_pos
+
+    def wait(self, timeout):
+        self.source.wait(timeout)
+
+    def next_frame(self, frame_time):
+        """Writes the frame that just ended to the log"""
+        mouse_pos = self._mouse_pos or self._last_mouse_pos
+        write = self._file.write
+        write(_FRAME.pack(frame_time, *mouse_pos, len(self._events)))
+        for event in self._events:
+            value = getattr(event, 'key', getattr(event, 'button', 0))
+            x, y = getattr(event, 'pos', (0, 0))
+            write(_EVENT.pack(LOGGED_EVENTS.index(event.type), value, x, y))
+        self._events = []
+        self._last_mouse_pos = mouse_pos
+        self._mouse_pos = None
+        self.frames += 1
+        self.source.next_frame(frame_time)
+
+    def close(self):
+        self._file.close()
+
+
+class ReplayInput:
+    """Input played back from a log written by InputRecorder.
+
+    === Public Attributes ===
+    seed: seed of the recorded game
+    screen_size: size of the recorded game's screen
+    frame_times: length (s) of every recorded frame
+    frame: number of the current frame
+    mouse_pos: current mouse position
+    """
+    seed: int
+    screen_size: tuple[int, int]
+    frame_times: list[float]
+    frame: int
+    mouse_pos: tuple[int, int]
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, self.seed, width, height = \
+            _HEADER.unpack_from(data)
+        if magic != LOG_MAGIC or version != LOG_VERSION:
+            raise ValueError(f'{path} is not a version {LOG_VERSION} '
+                             f'input log')
+        self.screen_size = (width, height)
+        self.frame_times = []
+        self._frames = []
+        offset = _HEADER.size
+        while offset < len(data):
+            frame_time, x, y, count = _FRAME.unpack_from(data, offset)
+            offset += _FRAME.size
+            events = []
+            for _ in range(count):
+                code, value, ex, ey = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                events.append(self._event(LOGGED_EVENTS[code], value,
+                                          (ex, ey)))
+            self.frame_times.append(frame_time)
+            self._frames.append(((x, y), events))
+        self.frame = 0
+        self.mouse_pos = (0, 0)
+        self._events = []
+        self._load_frame()
+
+    @staticmethod
+    def _event(event_type, value, pos):
+        if event_type in (pygame.KEYDOWN, pygame.KEYUP):
+            return pygame.event.Event(event_type, key=value)
+        if event_type == pygame.MOUSEBUTTONDOWN:
+            return pygame.event.Event(event_type, button=value, pos=pos)
+        return pygame.event.Event(event_type)
+
+    def _load_frame(self):
+        if self.frame < len(self._frames):
+            self.mouse_pos, events = self._frames[self.frame]
+            self._events = list(events)
+
+    def get_events(self):
+        events, self._events = self._events, []
+        return events
+
+    def get_mouse_pos(self):
+        return self.mouse_pos
+
+    def wait(self, timeout):
+        """Replayed input never blocks"""
+
+    def next_frame(self, frame_time):
+        """Moves on to the next recorded frame"""
+        self.frame += 1
+        self._load_frame()
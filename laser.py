@@ -1,46 +1,96 @@
 import math
-import random
 
-import pygame
-from pygame.sprite import Sprite
+from pygame import Rect
+from assets import Assets
+from entity import Entity
 
 
-class Laser(Sprite):
-    """
+class Laser(Entity):
+    """Built from a class bound to a game (see Entity.bind), which holds
+    what every laser shares
+
     === Public Attributes ===
-    speed: speed of projectile
+    speed: speed of projectile (pixels per second)
     image: image of projectile
+    pool: LaserPool this laser returns to once it leaves play (or None)
+    bounds: area outside of which the laser is culled
+    fired_at: time (ms) the laser was last fired
     """
+    __slots__ = ('image', 'rect', 'x', 'y', 'direction', 'fired_at')
+    pool = None
+
+    @classmethod
+    def shared_state(cls, fof_game):
+        state = super().shared_state(fof_game)
+        settings = fof_game.settings
+        # Far enough past the screen edge to still reach enemies that spawn
+        # partly off screen
+        margin = settings.laser_cull_margin
+        state.update(bounds=Rect(0, 0, settings.screen_width,
+                                 settings.screen_height).inflate(2 * margin,
+                                                                 2 * margin))
+        return state
+
+    @property
+    def speed(self):
+        return self.settings.laser_speed
+
+    @property
+    def input(self):
+        # Read from the game, which may swap its input source after start
+        return self.game.input
 
-    def __init__(self, fof_game):
+    def __init__(self):
         super().__init__()
-        self.settings = fof_game.settings
-        self.screen = fof_game.screen
-        self.speed = self.settings.laser_speed
-        self.orb = fof_game.orb
-        sr = self.settings.screen_ratio
-        images = ['blue-laser.bmp', 'red-laser.bmp', 'green-laser.bmp']
-        random_image = random.choice(images)
-        image = pygame.image.load(f'images/{random_image}')
-        image = pygame.transform.smoothscale(image, (40 * sr, 30 * sr))
+        self.launch()
+
+    def launch(self):
+        """Fires this laser from the orb towards the mouse cursor"""
         self.direction = self._calculate_proj_vector()
         angle = (180/math.pi) * math.atan(self.direction[1]/self.direction[0])
-        self.image = pygame.transform.rotate(image, -angle)
+        self.image = self.assets.laser(
+            self.rng.choice(Assets.LASER_COLOURS), angle)
 
         self.rect = self.image.get_rect()
         self.rect.center = self.orb.rect.center
         self.x = float(self.rect.x)
         self.y = float(self.rect.y)
+        self.fired_at = self.game_clock.get_ticks()
 
-    def update(self):
-        self.x += self.direction[0]
-        self.y += self.direction[1]
+    def update(self, dt):
+        """Moves the laser for a simulation step of dt seconds, and culls it
+        once it is out of bounds or has outlived settings.laser_lifetime"""
+        self.x += self.direction[0] * dt
+        self.y += self.direction[1] * dt
         self.rect.y = self.y
         self.rect.x = self.x
+        if not self.bounds.colliderect(self.rect) or \
+                self.game_clock.get_ticks() - self.fired_at \
+                > self.settings.laser_lifetime:
+            self.kill()
+
+    def path(self, dt):
+        """Start and end of the laser's centre over its last step of dt
+        seconds"""
+        cx, cy = self.rect.center
+        return ((cx - self.direction[0] * dt, cy - self.direction[1] * dt),
+                (cx, cy))
+
+    def remove_internal(self, group):
+        super().remove_internal(group)
+        if self.pool is not None and not self.alive():
+            self.pool.release(self)
+
+    def kill(self):
+        # Entity.kill bypasses remove_internal on the laser itself
+        was_alive = self.alive()
+        super().kill()
+        if self.pool is not None and was_alive:
+            self.pool.release(self)
 
     def _calculate_proj_vector(self) -> tuple[float, float]:
-        """Get resulting vector relative to mouse cursor"""
-        location = pygame.mouse.get_pos()
+        """Get resulting velocity (pixels per second) towards mouse cursor"""
+        location = self.input.get_mouse_pos()
         resultant = (location[0] - self.orb.rect.center[0],
                      location[1] - self.orb.rect.center[1])
         # HANDLE ZERO DIVISION ERROR
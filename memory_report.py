@@ -0,0 +1,84 @@
+"""Reports the memory taken by live entities: bytes per Cloud, Red and
+Laser and the total traced heap with 1k, 10k and 100k of each alive.
+
+    python memory_report.py
+    python memory_report.py --counts 1000 10000 --out memory.json
+
+Bytes per entity cover everything allocated to keep one alive: the object,
+its rect, its group entry and its share of the EnemyStore arrays. Surfaces
+are allocated by SDL, outside the traced heap, and all entities of a type
+share theirs.
+"""
+import argparse
+import gc
+import json
+import sys
+import time
+import tracemalloc
+
+from headless import make_game
+
+COUNTS = (1000, 10000, 100000)
+KINDS = ('cloud', 'red', 'laser')
+
+
+def spawn(game, kind, count):
+    """Brings count entities of kind to life in game"""
+    if kind == 'laser':
+        game.settings.max_lasers = count
+        for _ in range(count):
+            game.laser_pool.fire()
+        return
+    build = game.Cloud if kind == 'cloud' else game.Red
+    for _ in range(count):
+        game.enemies.add(build())
+
+
+def measure(kind, count, seed=0):
+    """Memory (bytes) taken by count live entities of kind"""
+    gc.collect()
+    tracemalloc.start()
+    game = make_game(seed)
+    # Aim away from the orb so lasers get a direction
+    game.input.mouse_pos = (0, 0)
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    spawn(game, kind, count)
+    gc.collect()
+    heap, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    group = game.lasers if kind == 'laser' else game.enemies
+    entity = next(iter(group))
+    return {'bytes_per_entity': (heap - before) / count,
+            'object_bytes': sys.getsizeof(entity),
+            'heap_bytes': heap,
+            'peak_bytes': peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=COUNTS)
+    parser.add_argument('--kinds', nargs='+', choices=KINDS, default=KINDS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='also write the results to this .json')
+    args = parser.parse_args()
+    # Keeps one-time allocations (fonts, text cache) out of the first result
+    make_game(args.seed)
+    results = {}
+    for kind in args.kinds:
+        for count in args.counts:
+            r = measure(kind, count, args.seed)
+            results.setdefault(kind, {})[str(count)] = r
+            print(f'{kind:<6} {count:>7}: {r["bytes_per_entity"]:7.1f} B each'
+                  f' ({r["object_bytes"]} B object),'
+                  f' heap {r["heap_bytes"] / 2 ** 20:7.1f} MiB')
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                       'python': sys.version.split()[0],
+                       'results': results}, f, indent=2)
+        print(f'wrote {args.out}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,4 @@
-import pygame
+from animation import Animator
 
 
 class Orb:
@@ -9,7 +9,8 @@ class Orb:
     screen_rect: rectangle of the screen object
     settings: contains all the game settings
 
-    image: the bmp file that displays the orb
+    image: current frame of the orb's spin
+    spin: playback position within the orb's shared spin cycle
     rect: Current Orb's rectangle
     x: Current Orb's horizontal position
     y: Current Orb's vertical position
@@ -23,11 +24,10 @@ class Orb:
         self.screen = fof_game.screen
         self.screen_rect = fof_game.screen.get_rect()
         self.settings = fof_game.settings
-        sr = self.settings.screen_ratio
-        # load the ship image and get its rect
-        image = pygame.image.load('images/orb.bmp')
-        self.image = \
-            pygame.transform.smoothscale(image, (int(80 * sr), int(80 * sr)))
+        self.timers = fof_game.timers
+        # get the shared orb image and its rect
+        self.spin = Animator(fof_game.assets.animation('orb'))
+        self.spin.play(self.timers)
         self.rect = self.image.get_rect()
         self.rect.center = self.screen_rect.center
         self.x = float(self.rect.x)
@@ -38,30 +38,26 @@ class Orb:
         self.moving_up = False
         self.moving_down = False
         self.blinking = False
-        self.last_rotated = 0
         # self.last_pressed = []
-        self.last_blinked = 0
+        self._blink_timer = None
 
-    def update(self):
-        now = pygame.time.get_ticks()
+    @property
+    def image(self):
+        return self.spin.image
+
+    def update(self, dt):
+        """Moves the orb for a simulation step of dt seconds"""
+        step = self.settings.orb_speed * dt
         if self.moving_right and self.rect.right < self.screen_rect.right:
-            self.x += self.settings.orb_speed
+            self.x += step
         if self.moving_left and self.rect.left > 0:
-            self.x -= self.settings.orb_speed
+            self.x -= step
         if self.moving_up and self.rect.top > 0:
-            self.y -= self.settings.orb_speed
+            self.y -= step
         if self.moving_down and self.rect.bottom < self.screen_rect.bottom:
-            self.y += self.settings.orb_speed
-        if self.blinking:
-            if now - self.last_blinked \
-                    >= self.settings.blink_time:
-                self._stop_blinking()
-                self.blinking = False
+            self.y += step
         self.rect.x = self.x
         self.rect.y = self.y
-        if now - self.last_rotated >= self.settings.rotation_speed:
-            self.image = pygame.transform.rotate(self.image, 90)
-            self.last_rotated = now
 
     def blink(self):
         # try:
@@ -76,12 +72,19 @@ class Orb:
         #     self.y -= self.settings.blink_distance
         # elif last_pressed == 4:
         #     self.y += self.settings.blink_distance
-        self.settings.orb_speed += self.settings.blink_speed
+        # The boost is added once; a new blink only restarts the wait
+        if not self.blinking:
+            self.settings.orb_speed += self.settings.blink_speed
         self.blinking = True
-        self.last_blinked = pygame.time.get_ticks()
+        if self._blink_timer is not None:
+            self._blink_timer.cancel()
+        self._blink_timer = self.timers.schedule(self.settings.blink_time,
+                                                 self._stop_blinking)
 
     def _stop_blinking(self):
         self.settings.orb_speed -= self.settings.blink_speed
+        self.blinking = False
+        self._blink_timer = None
 
     def reset_movement(self):
         self.moving_up = False
@@ -89,6 +92,8 @@ class Orb:
         self.moving_left = False
         self.moving_right = False
         self.rect.center = self.screen_rect.center
+        self.x = float(self.rect.x)
+        self.y = float(self.rect.y)
 
     def blitme(self):
         """Draw the ship at its current location"""
@@ -0,0 +1,151 @@
+import csv
+import json
+import time
+
+import pygame
+
+PHASES = ('events', 'timers', 'orb', 'lasers', 'enemies', 'spawn', 'broadphase',
+          'laser_collisions', 'orb_collisions', 'render')
+COLUMNS = PHASES + ('frame', 'work', 'enemies_count', 'lasers_count')
+
+
+def percentile(values, p):
+    """Nearest-rank percentile p (0 to 100) of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1,
+                      int(round(p / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+class FrameProfiler:
+    """Per-phase timings and entity counts of the most recent game-phase
+    frames, kept in a fixed-size ring buffer. Phases that run once per
+    simulation step add up over the frame.
+
+    === Public Attributes ===
+    capacity: number of frames kept
+    frames: number of frames recorded since the game started
+    overlay: True iff the stats overlay is drawn (toggled with F3)
+    """
+    capacity: int
+    frames: int
+    overlay: bool
+
+    def __init__(self, fof_game):
+        self.game = fof_game
+        self.capacity = fof_game.settings.profile_frames
+        self.frames = 0
+        self.overlay = False
+        # Times are kept in ms; every row is reused once the buffer wraps
+        self._rows = [[0.0] * len(COLUMNS) for _ in range(self.capacity)]
+        self._row = self._rows[0]
+        self._column = {name: i for i, name in enumerate(COLUMNS)}
+        self._start = 0.0
+        self._last = 0.0
+        self._overlay_image = None
+        self._overlay_frame = -1
+
+    def begin_frame(self, frame_time):
+        """Starts recording a frame that came frame_time seconds after the
+        previous one"""
+        row = self._rows[self.frames % self.capacity]
+        for i in range(len(row)):
+            row[i] = 0.0
+        row[self._column['frame']] = frame_time * 1000
+        self._row = row
+        self._start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        """Charges the time since the previous mark to phase"""
+        now = time.perf_counter()
+        self._row[self._column[phase]] += (now - self._last) * 1000
+        self._last = now
+
+    def end_frame(self, enemies, lasers):
+        """Finishes the frame with the entity counts it ended on"""
+        row = self._row
+        work = time.perf_counter() - self._start
+        row[self._column['work']] = work * 1000
+        row[self._column['enemies_count']] = enemies
+        row[self._column['lasers_count']] = lasers
+        self.frames += 1
+
+    def last(self, name):
+        """Value of one column in the most recently finished frame"""
+        return self._rows[(self.frames - 1) % self.capacity][
+            self._column[name]]
+
+    def rows(self):
+        """Recorded frames, oldest first, as dicts of column: value"""
+        count = min(self.frames, self.capacity)
+        first = self.frames - count
+        return [dict(zip(COLUMNS, self._rows[i % self.capacity]))
+                for i in range(first, self.frames)]
+
+    def column(self, name):
+        """Every recorded value of one column, in buffer order"""
+        i = self._column[name]
+        return [row[i] for row in self._rows[:min(self.frames,
+                                                  self.capacity)]]
+
+    def summary(self):
+        """p50/p95/p99 (ms) of the frame interval, the work done in each
+        frame and each phase"""
+        return {name: {p: percentile(self.column(name), p)
+                       for p in (50, 95, 99)}
+                for name in ('frame', 'work') + PHASES}
+
+    def dump(self, path):
+        """Writes the buffer to path, as JSON if it ends in .json and as CSV
+        otherwise"""
+        rows = self.rows()
+        with open(path, 'w', newline='') as f:
+            if path.endswith('.json'):
+                json.dump({'columns_ms': PHASES + ('frame', 'work'),
+                           'summary': self.summary(), 'frames': rows}, f,
+                          indent=1)
+            else:
+                writer = csv.DictWriter(f, fieldnames=COLUMNS)
+                writer.writeheader()
+                writer.writerows(rows)
+
+    def draw_overlay(self, screen):
+        """Draws the stats overlay in the top left corner if it is enabled,
+        and returns the area it covered (or None)"""
+        if not self.overlay:
+            return None
+        # Percentiles are recomputed about every quarter of a second
+        if self._overlay_image is None or \
+                self.frames - self._overlay_frame >= 30:
+            self._overlay_image = self._render_overlay()
+            self._overlay_frame = self.frames
+        return screen.blit(self._overlay_image, (10, 10))
+
+    def _render_overlay(self):
+        stats = self.summary()
+        slowest = max(PHASES, key=lambda name: stats[name][95])
+        last = self._rows[(self.frames - 1) % self.capacity]
+        lines = ['frame p50 {:5.1f} p95 {:5.1f} p99 {:5.1f} ms'.format(
+                     *stats['frame'].values()),
+                 'work  p50 {:5.1f} p95 {:5.1f} p99 {:5.1f} ms'.format(
+                     *stats['work'].values()),
+                 f'p95 slowest: {slowest} {stats[slowest][95]:.2f} ms',
+                 f'enemies {int(last[self._column["enemies_count"]])} '
+                 f'lasers {int(last[self._column["lasers_count"]])}']
+        lines.extend(self.game.assets.report())
+        if self.game.governor is not None:
+            lines.extend(self.game.governor.readout())
+        font = self.game.get_font_2(16)
+        images = [font.render(line, True, 'White', 'Black')
+                  for line in lines]
+        width = max(image.get_width() for image in images)
+        height = sum(image.get_height() for image in images)
+        # Same pixel format as the screen, so blitting it is cheap
+        overlay = pygame.Surface((width, height)).convert()
+        y = 0
+        for image in images:
+            overlay.blit(image, (0, y))
+            y += image.get_height()
+        return overlay
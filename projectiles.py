@@ -0,0 +1,61 @@
+from laser import Laser
+
+
+class LaserPool:
+    """Fixed-capacity pool of Laser sprites. A laser that hits, leaves the
+    screen or expires drops out of the live group and waits here to be fired
+    again, so long sessions neither allocate nor accumulate lasers.
+
+    === Public Attributes ===
+    lasers: the group of live lasers
+    created: number of Laser objects ever built by the pool
+    """
+    created: int
+
+    def __init__(self, fof_game):
+        self.settings = fof_game.settings
+        self.lasers = fof_game.lasers
+        self.created = 0
+        self._free = []
+        # Lasers of this game, returning to this pool
+        self.Laser = Laser.bind(fof_game, pool=self)
+
+    @property
+    def live(self):
+        """Number of lasers in play"""
+        return len(self.lasers)
+
+    @property
+    def pooled(self):
+        """Number of lasers waiting to be reused"""
+        return len(self._free)
+
+    def fire(self):
+        """Fires a laser towards the mouse cursor, reusing a pooled one if
+        possible. When settings.max_lasers are already live, the oldest one
+        is recycled. Returns the laser, or None if max_lasers is 0."""
+        if self.settings.max_lasers < 1:
+            return None
+        self.trim(self.settings.max_lasers - 1)
+        if self._free:
+            laser = self._free.pop()
+            laser.launch()
+        else:
+            laser = self.Laser()
+            self.created += 1
+        self.lasers.add(laser)
+        return laser
+
+    def trim(self, count):
+        """Recycles the oldest live lasers until at most count are left"""
+        while len(self.lasers) > max(count, 0):
+            # Groups keep insertion order, so the first sprite is the oldest
+            next(iter(self.lasers.spritedict)).kill()
+
+    def release(self, laser):
+        """Takes back a laser that has left play"""
+        self._free.append(laser)
+
+    def clear(self):
+        """Returns every live laser to the pool"""
+        self.lasers.empty()
@@ -0,0 +1,204 @@
+import statistics
+import time
+
+import pygame
+
+
+class Renderer:
+    """Draws the game phase by redrawing the whole screen every frame"""
+
+    def __init__(self, fof_game):
+        self.game = fof_game
+        self.screen = fof_game.screen
+
+    def invalidate(self):
+        """Called when something other than the renderer drew on the
+        screen. A full redraw never relies on what is already there."""
+
+    def frame_done(self, work):
+        """Called after every game-phase frame with the time (ms) the whole
+        frame took to simulate and draw"""
+
+    def _draw_scene(self):
+        """Draws every sprite and the HUD on top of the background.
+        Returns the area of the profiler overlay, if it is shown."""
+        game = self.game
+        game.orb.blitme()
+        game.lasers.draw(self.screen)
+        game.enemies.draw(self.screen)
+        return self._draw_ui()
+
+    def _draw_ui(self):
+        """Draws the HUD, crosshair and profiler overlay, and returns the
+        area of the overlay (or None)"""
+        game = self.game
+        game.hud.show_score()
+        game.crosshair.blitme()
+        return game.profiler.draw_overlay(self.screen)
+
+    def draw(self):
+        # Blit background photo onto display screen
+        self.screen.blit(self.game.bg, (0, 0))
+        overlay = self._draw_scene()
+        # Makes recently created screen visible
+        pygame.display.flip()
+        return overlay
+
+
+class DirtyRectRenderer(Renderer):
+    """Draws the game phase by restoring the background only under the
+    sprites of the previous frame and pushing only the changed regions to
+    the display. Falls back to a full redraw when the changed area is more
+    than settings.dirty_rect_limit of the screen.
+
+    === Public Attributes ===
+    full_redraws: number of frames that were drawn in full
+    partial_redraws: number of frames that updated dirty rects only
+    """
+    full_redraws: int
+    partial_redraws: int
+
+    def __init__(self, fof_game):
+        super().__init__(fof_game)
+        self.screen_rect = self.screen.get_rect()
+        self.full_redraws = 0
+        self.partial_redraws = 0
+        # Screen areas drawn over during the last frame
+        self._drawn = []
+        self._valid = False
+
+    def invalidate(self):
+        self._valid = False
+
+    def _scene_rects(self, overlay):
+        """Screen areas covered by the scene that was just drawn"""
+        game = self.game
+        rects = [game.orb.rect.clip(self.screen_rect)]
+        # Group.draw records the (clipped) rect each sprite was blitted to
+        rects.extend(game.lasers.spritedict.values())
+        rects.extend(game.enemies.spritedict.values())
+        rects.append(game.hud.score_rect.clip(self.screen_rect))
+        rects.append(game.crosshair.rect.clip(self.screen_rect))
+        if overlay:
+            rects.append(overlay)
+        return [rect for rect in rects if rect]
+
+    def draw(self):
+        if not self._valid:
+            self._full_redraw()
+            return
+        bg = self.game.bg
+        erased = self._drawn
+        for rect in erased:
+            self.screen.blit(bg, rect, rect)
+        overlay = self._draw_scene()
+        self._drawn = self._scene_rects(overlay)
+        dirty = erased + self._drawn
+        area = sum(rect.width * rect.height for rect in dirty)
+        screen_area = self.screen_rect.width * self.screen_rect.height
+        if area > self.game.settings.dirty_rect_limit * screen_area:
+            # Many small updates cost more than one flip past this point
+            pygame.display.flip()
+            self.full_redraws += 1
+        else:
+            pygame.display.update(dirty)
+            self.partial_redraws += 1
+
+    def _full_redraw(self):
+        overlay = super().draw()
+        self._drawn = self._scene_rects(overlay)
+        self._valid = True
+        self.full_redraws += 1
+
+
+class ScaledRenderer(Renderer):
+    """Draws the background and sprites to an offscreen surface at
+    settings.render_scale of the display size, then scales that up to the
+    display once per frame. The game itself keeps running in display
+    coordinates, so only drawing changes. The HUD, crosshair and profiler
+    overlay are drawn afterwards at full resolution.
+
+    With settings.auto_render_scale, the scale is lowered in steps of
+    render_scale_step while frames take longer than 1 / target_fps
+    seconds, and raised again once they are comfortably faster or once
+    the larger scale is measured to draw faster after all.
+
+    === Public Attributes ===
+    scale: current fraction of the display size the scene is drawn at
+    """
+    scale: float
+
+    def __init__(self, fof_game):
+        super().__init__(fof_game)
+        self.settings = fof_game.settings
+        self.assets = fof_game.assets
+        self.size = self.screen.get_size()
+        self.scale = 0.0
+        self.surface = None
+        self._work = []
+        self._render = []
+        # Median draw time (ms) last measured at each scale
+        self._costs = {}
+        self.set_scale(self.settings.render_scale)
+
+    def set_scale(self, scale):
+        """Changes the internal resolution to scale of the display size"""
+        scale = round(min(max(scale, self.settings.render_scale_min), 1.0), 2)
+        if scale == self.scale:
+            return
+        self.scale = scale
+        self.assets.set_render_scale(scale)
+        width, height = self.size
+        self.surface = pygame.Surface(
+            (max(1, round(width * scale)), max(1, round(height * scale))))
+        self.surface = self.surface.convert()
+
+    def draw(self):
+        start = time.perf_counter()
+        if self.scale == 1.0:
+            overlay = super().draw()
+            self._render.append((time.perf_counter() - start) * 1000)
+            return overlay
+        game = self.game
+        scale = self.scale
+        scaled = self.assets.scaled
+        surface = self.surface
+        surface.blit(scaled[game.bg], (0, 0))
+        sprites = [game.orb]
+        sprites.extend(game.lasers.sprites())
+        sprites.extend(game.enemies.sprites())
+        # Blit positions may be floats; pygame truncates them
+        surface.blits([(scaled[sprite.image], (sprite.rect.x * scale,
+                                               sprite.rect.y * scale))
+                       for sprite in sprites], doreturn=False)
+        pygame.transform.scale(surface, self.size, self.screen)
+        overlay = self._draw_ui()
+        pygame.display.flip()
+        self._render.append((time.perf_counter() - start) * 1000)
+        return overlay
+
+    def frame_done(self, work):
+        if not self.settings.auto_render_scale:
+            self._render.clear()
+            return
+        self._work.append(work)
+        if len(self._work) < self.settings.render_scale_window:
+            return
+        work = statistics.median(self._work)
+        render = statistics.median(self._render) if self._render else 0.0
+        self._work.clear()
+        self._render.clear()
+        budget = 1000 / self.settings.target_fps
+        step = self.settings.render_scale_step
+        self._costs[self.scale] = render
+        lower = round(self.scale - step, 2)
+        higher = round(self.scale + step, 2)
+        # Scaling up the frame costs about as much as a full-size blit, so
+        # a smaller scale is only kept while it actually draws faster
+        if self._costs.get(higher, render) < render:
+            self.set_scale(higher)
+        elif work > budget and render > 0.25 * work and \
+                self._costs.get(lower, 0.0) < render:
+            self.set_scale(lower)
+        elif work < 0.6 * budget and self.scale < 1.0:
+            self.set_scale(higher)
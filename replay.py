@@ -0,0 +1,79 @@
+"""Records a real play session to an input log, or replays a log at full
+speed to time every frame on exactly the same workload.
+
+    python replay.py record session.swl
+    python replay.py play session.swl --out frames.json
+
+Recorded games run on simulated time and a logged seed, so a replay goes
+through the same frames, spawns and collisions as the session did.
+"""
+import argparse
+import json
+import random
+import time
+
+from fight_or_flight import FightOrFlight
+from headless import snapshot, digest
+from inputs import LiveInput, InputRecorder, ReplayInput
+from profiler import percentile
+
+
+def record(path, seed=None):
+    """Plays the game live, logging every frame's input to path"""
+    if seed is None:
+        seed = random.getrandbits(62)
+    game = FightOrFlight(seed=seed)
+    recorder = InputRecorder(LiveInput(), path, seed,
+                             (game.settings.screen_width,
+                              game.settings.screen_height))
+    game.input = recorder
+    try:
+        game.run_game()
+    finally:
+        # Quitting the game exits the loop by raising SystemExit
+        recorder.close()
+
+
+def play(path, render=True):
+    """Replays the log at path as fast as possible and returns the frame
+    times (ms) it took, with the state it ended on"""
+    replay = ReplayInput(path)
+    game = FightOrFlight(headless=True, seed=replay.seed,
+                         input_source=replay, screen_size=replay.screen_size)
+    times = []
+    for frame_time in replay.frame_times:
+        start = time.perf_counter()
+        game.run_frame(frame_time, render=render)
+        times.append((time.perf_counter() - start) * 1000)
+    return times, game
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    rec = commands.add_parser('record', help='play and log the input')
+    rec.add_argument('log')
+    rec.add_argument('--seed', type=int)
+    rep = commands.add_parser('play', help='replay a log at full speed')
+    rep.add_argument('log')
+    rep.add_argument('--no-render', action='store_true',
+                     help='skip drawing the game phase')
+    rep.add_argument('--out', help='write every frame time to this .json')
+    args = parser.parse_args()
+    if args.command == 'record':
+        record(args.log, args.seed)
+        return
+    times, game = play(args.log, not args.no_render)
+    report = {'frames': len(times),
+              'total_ms': sum(times),
+              'frame_ms': {p: percentile(times, p) for p in (50, 95, 99)},
+              'score': game.stats.score,
+              'digest': digest(snapshot(game))}
+    print(json.dumps(report))
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(dict(report, times_ms=times), f)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,38 +12,128 @@ class Settings:
     screen_height: int
     bg_colour: tuple[int, int, int]
 
-    def __init__(self):
-        # Screen Settings
-        screen_size = pygame.display.Info()
-        self.screen_width = screen_size.current_w
-        self.screen_height = screen_size.current_h
+    def __init__(self, screen_size=None):
+        # Screen Settings (the whole display unless a size is given)
+        if screen_size is None:
+            info = pygame.display.Info()
+            screen_size = (info.current_w, info.current_h)
+        self.screen_width, self.screen_height = screen_size
         # screen ratio will be used to scale depending on display size
         self.screen_ratio = self.screen_width / 2560
         self.bg_colour = (0, 0, 0)
-        self.orb_speed = 4
-        self.blink_speed = 30
+        # The simulation advances in fixed steps of 1 / sim_rate seconds,
+        # independently of how often the screen is redrawn (render_fps,
+        # 0 for uncapped)
+        self.sim_rate = 144
+        self.render_fps = 144
+        # Longest frame (s) the simulation catches up on at once
+        self.max_frame_time = 0.25
+        # The game phase is drawn at render_scale of the display size and
+        # scaled up; with auto_render_scale the scale moves between
+        # render_scale_min and 1 in render_scale_step steps, judged every
+        # render_scale_window frames, to hold target_fps
+        self.render_scale = 1.0
+        self.auto_render_scale = False
+        self.render_scale_min = 0.5
+        # pygame scales up by exactly 2 about twice as fast as by any other
+        # factor, so by default the scale is either 1 or 0.5
+        self.render_scale_step = 0.5
+        self.render_scale_window = 60
+        self.target_fps = 144
+        # The menu and pause screens sleep until input (at most idle_timeout
+        # ms) and redraw at most idle_fps times a second
+        self.idle_fps = 30
+        self.idle_timeout = 250
+        # Length (ms) of the death banner (and of its zoom-in), and the
+        # longest the game over screen stays up
+        self.death_time = 1500
+        self.death_zoom_time = 300
+        self.game_over_time = 4000
+        # Redraw only the regions that changed, unless they cover more than
+        # dirty_rect_limit of the screen
+        self.dirty_rects = False
+        self.dirty_rect_limit = 0.5
+        # Speeds are in pixels per second
+        self.orb_speed = 576
+        self.blink_speed = 4320
         self.blink_time = 13
         self.rotation_speed = 75
-        self.laser_speed = 30
-        self.cloud_speed = 5
-        self.red_speed = 30
+        self.laser_speed = 4320
+        # Most lasers alive at once; older ones are recycled beyond it
+        self.max_lasers = 256
+        # Lasers are culled after laser_lifetime ms or once they are
+        # laser_cull_margin px past the screen edge
+        self.laser_lifetime = 3000
+        self.laser_cull_margin = int(200 * self.screen_ratio)
+        # Degrees between the pre-rendered laser rotations
+        self.laser_angle_step = 1
+        self.cloud_speed = 720
+        self.red_speed = 4320
         self.cloud_cooldown = 1600
         self.cloud_cooldown_min = 400
         self.red_cooldown = 150000
         self.red_cooldown_min = 70000
+        # Most enemies alive at once, Reds included
         self.max_enemies = 69
+        # Spawn gaps and positions planned at a time
+        self.spawn_batch = 64
+        # Frames of phase timings the profiler keeps, and the .csv or .json
+        # file they are written to on exit (None to not write them)
+        self.profile_frames = 600
+        self.profile_dump = None
+        # Pre-scaled images written by asset_bundle.py, used when present
+        self.asset_bundle = 'images/assets.bundle'
+        # Most rendered text surfaces kept for reuse
+        self.text_cache_size = 128
+        # Update enemies in NumPy batches (ignored if NumPy is missing)
+        self.batched_enemies = True
+        # Steer enemies with a shared grid of headings towards the orb
+        # instead of working each heading out (flow_cell_size px cells)
+        self.flow_field = False
+        self.flow_cell_size = max(16, int(160 * self.screen_ratio))
+        # Side (px) of a spatial hash cell, about the size of a large enemy
+        self.collision_cell_size = max(16, int(160 * self.screen_ratio))
+        # Lasers hit what they passed through during a step, not only what
+        # they touch at its end, so long steps cannot skip small enemies
+        self.swept_lasers = True
+        # While far_cloud_interval (ms) is set, Clouds further than
+        # far_cloud_distance px from the orb decide that rarely instead of
+        # every 15 ms; the quality governor sets it
+        self.far_cloud_interval = None
+        self.far_cloud_distance = int(900 * self.screen_ratio)
+        # Give up detail (see governor.py) to hold target_fps, judged every
+        # governor_window frames; a level is taken back once frames take
+        # less than governor_release of the budget with fewer enemies. The
+        # governor draws through ScaledRenderer, so dirty_rects is ignored
+        self.quality_governor = False
+        self.governor_window = 60
+        self.governor_release = 0.6
+        # What the governor's levers give up to: far Cloud decisions every
+        # governor_cloud_interval ms, off-screen Red spins checked every
+        # governor_spin_check ms, at most governor_max_lasers lasers
+        self.governor_cloud_interval = 60
+        self.governor_spin_check = 100
+        self.governor_max_lasers = 64
+        # .csv file the governor's decisions are written to on exit (None
+        # to not write them)
+        self.governor_log = 'governor.csv'
 
 
 class Crosshair:
     def __init__(self, fof):
-        image = pygame.image.load('images/crosshair.bmp')
-        self.image = pygame.transform.smoothscale(image, (17, 17))
+        self.fof = fof
+        self.image = fof.assets.get('crosshair')
         self.rect = self.image.get_rect()
-        self.rect.center = pygame.mouse.get_pos()
+        self.rect.center = self.input.get_mouse_pos()
         self.screen = fof.screen
 
+    @property
+    def input(self):
+        # Read from the game, which may swap its input source after start
+        return self.fof.input
+
     def update_crosshair(self):
-        self.rect.center = pygame.mouse.get_pos()
+        self.rect.center = self.input.get_mouse_pos()
 
     def blitme(self):
         self.screen.blit(self.image, self.rect)
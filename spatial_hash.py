@@ -0,0 +1,61 @@
+class SpatialHash:
+    """Uniform grid that buckets sprites by the cells their rect covers, so
+    collision passes only test sprites that are near each other.
+
+    === Public Attributes ===
+    cell_size: width and height (px) of one grid cell
+    """
+    cell_size: int
+
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self._cells = {}
+        # Insertion position of every sprite, so queries return sprites in
+        # the same order as the group they were built from
+        self._order = {}
+
+    def __len__(self):
+        return len(self._order)
+
+    def clear(self):
+        self._cells.clear()
+        self._order.clear()
+
+    def _cell_range(self, rect):
+        cs = self.cell_size
+        return (range(rect.left // cs, (rect.right - 1) // cs + 1),
+                range(rect.top // cs, (rect.bottom - 1) // cs + 1))
+
+    def insert(self, sprite):
+        """Adds sprite to every cell its rect overlaps"""
+        self._order[sprite] = len(self._order)
+        xs, ys = self._cell_range(sprite.rect)
+        cells = self._cells
+        for cx in xs:
+            for cy in ys:
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [sprite]
+                else:
+                    bucket.append(sprite)
+
+    def build(self, sprites):
+        """Replaces the contents of the grid with sprites"""
+        self.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def query(self, rect):
+        """Returns the sprites sharing a cell with rect, in insertion order.
+        These are only candidates; callers still test the rects."""
+        xs, ys = self._cell_range(rect)
+        cells = self._cells
+        found = set()
+        for cx in xs:
+            for cy in ys:
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    found.update(bucket)
+        if len(found) > 1:
+            return sorted(found, key=self._order.__getitem__)
+        return list(found)
@@ -0,0 +1,174 @@
+import math
+from collections import deque
+
+
+class SpawnDirector:
+    """Decides when and where enemies spawn. Gaps between spawns and border
+    positions are planned settings.spawn_batch at a time, and the next
+    spawn of each kind waits on a timer, so a step where nothing is due
+    costs nothing.
+
+    Every enemy counts towards settings.max_enemies; a spawn that falls due
+    while the swarm is full waits until there is room.
+
+    === Public Attributes ===
+    last_cloud_spawn: time (ms) the last Cloud spawned
+    last_red_spawn: time (ms) the last Red spawned
+    first_red: True iff the Red for reaching 690 points has spawned
+    """
+    last_cloud_spawn: float
+    last_red_spawn: float
+    first_red: bool
+
+    def __init__(self, fof_game):
+        self.game = fof_game
+        self.settings = fof_game.settings
+        self.rng = fof_game.rng
+        self.timers = fof_game.timers
+        self.last_cloud_spawn = 0
+        self.last_red_spawn = 0
+        self.first_red = False
+        # Planned gaps (ms) between consecutive spawns of each kind
+        self._cloud_gaps = deque()
+        self._red_gaps = deque()
+        self._positions = deque()
+        # Cooldown range each batch of gaps was planned for
+        self._planned = {}
+        # Timers for the next spawn of each kind
+        self._cloud_timer = None
+        self._red_timer = None
+
+    def reset(self):
+        """Starts a new game's timeline from now"""
+        now = self.timers.time
+        self.last_cloud_spawn = now
+        self.last_red_spawn = now
+        self.first_red = False
+        self._schedule_clouds()
+        self._schedule_reds()
+
+    def _plan_gaps(self, gaps, low, high):
+        """Plans the next batch of gaps between low and high ms.
+
+        The old spawner re-rolled a cooldown in [low, high] every frame, so
+        a spawn came soon after low far more often than near high. Sampling
+        that ramp directly (a Rayleigh tail starting at low) keeps the same
+        pacing at the simulation rate."""
+        frame = 1000 / self.settings.sim_rate
+        scale = 2 * max(high - low, 0) * frame
+        for _ in range(self.settings.spawn_batch):
+            tail = math.sqrt(-scale * math.log(1.0 - self.rng.random()))
+            gaps.append(min(low + tail, high))
+
+    def _plan_positions(self):
+        """Plans the next batch of spawn points, anywhere on the border
+        just off screen"""
+        rng = self.rng
+        min_x = min_y = -20
+        max_x = self.settings.screen_width + 20
+        max_y = self.settings.screen_height + 20
+        for _ in range(self.settings.spawn_batch):
+            side = rng.randrange(4)
+            if side == 0:
+                # Top
+                self._positions.append((rng.randrange(min_x, max_x), min_y))
+            elif side == 1:
+                # Bottom
+                self._positions.append((rng.randrange(min_x, max_x), max_y))
+            elif side == 2:
+                # Left
+                self._positions.append((min_x, rng.randrange(min_y, max_y)))
+            else:
+                # Right
+                self._positions.append((max_x, rng.randrange(min_y, max_y)))
+
+    def next_position(self):
+        """Takes the next planned spawn point"""
+        if not self._positions:
+            self._plan_positions()
+        return self._positions.popleft()
+
+    def _next_gap(self, gaps, low, high):
+        # Changing the cooldowns mid-game throws the old plan away
+        if self._planned.get(id(gaps)) != (low, high):
+            gaps.clear()
+            self._planned[id(gaps)] = (low, high)
+        if not gaps:
+            self._plan_gaps(gaps, low, high)
+        return gaps[0]
+
+    def _schedule(self, timer, last, gap, callback):
+        """Replaces timer with one calling callback once more than gap ms
+        have passed since last"""
+        if timer is not None:
+            timer.cancel()
+        return self.timers.schedule(math.floor(last + gap) + 1
+                                    - self.timers.time, callback)
+
+    def _schedule_clouds(self):
+        settings = self.settings
+        self._cloud_timer = self._schedule(
+            self._cloud_timer, self.last_cloud_spawn,
+            self._next_gap(self._cloud_gaps, settings.cloud_cooldown_min,
+                           settings.cloud_cooldown), self._spawn_clouds)
+
+    def _schedule_reds(self):
+        settings = self.settings
+        self._red_timer = self._schedule(
+            self._red_timer, self.last_red_spawn,
+            self._next_gap(self._red_gaps, settings.red_cooldown_min,
+                           settings.red_cooldown), self._spawn_reds)
+
+    def _spawn_due(self, gaps, last, low, high, build):
+        """Spawns build() for every planned gap that has passed since last,
+        within the budget. Returns the time of the last spawn, and whether
+        a spawn still due is waiting for room."""
+        settings = self.settings
+        enemies = self.game.enemies
+        now = self.timers.time
+        # Gaps shorter than a step spawn several enemies at once, but a
+        # spawn that waited for room does not bring a backlog with it
+        catch_up = now - 1000 / settings.sim_rate
+        while now - last > self._next_gap(gaps, low, high):
+            if len(enemies) >= settings.max_enemies:
+                return last, True
+            last = max(last + gaps.popleft(), catch_up)
+            enemies.add(build())
+        return last, False
+
+    def _spawn_clouds(self):
+        settings = self.settings
+        self._cloud_timer = None
+        self.last_cloud_spawn, full = self._spawn_due(
+            self._cloud_gaps, self.last_cloud_spawn,
+            settings.cloud_cooldown_min, settings.cloud_cooldown,
+            self.game.Cloud)
+        if full:
+            # Looks for room again next step
+            self._cloud_timer = self.timers.schedule(
+                1000 / settings.sim_rate, self._spawn_clouds)
+        else:
+            self._schedule_clouds()
+
+    def _spawn_reds(self):
+        settings = self.settings
+        self._red_timer = None
+        self.last_red_spawn, full = self._spawn_due(
+            self._red_gaps, self.last_red_spawn, settings.red_cooldown_min,
+            settings.red_cooldown, self.game.Red)
+        if full:
+            self._red_timer = self.timers.schedule(
+                1000 / settings.sim_rate, self._spawn_reds)
+        else:
+            self._schedule_reds()
+
+    def update(self):
+        """Spawns the Red for reaching 690 points, once there is room.
+        Every other spawn is made by the timers."""
+        enemies = self.game.enemies
+        if not self.first_red and self.game.stats.score >= 690 and \
+                len(enemies) < self.settings.max_enemies:
+            enemies.add(self.game.Red())
+            self.last_red_spawn = self.timers.time
+            self.first_red = True
+            self._schedule_reds()
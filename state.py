@@ -0,0 +1,36 @@
+from enum import Enum
+
+
+class GameState(Enum):
+    """Scenes the game can be in"""
+    MENU = 'menu'
+    PLAYING = 'playing'
+    PAUSED = 'paused'
+    DYING = 'dying'
+    GAME_OVER = 'game over'
+
+
+class StateMachine:
+    """Current scene of the game and how long it has been showing. Time only
+    advances with the frames the main loop runs, so timed transitions never
+    block the loop.
+
+    === Public Attributes ===
+    current: the active GameState
+    elapsed: time (ms) spent in the current state
+    """
+    current: GameState
+    elapsed: float
+
+    def __init__(self, state=GameState.MENU):
+        self.current = state
+        self.elapsed = 0.0
+
+    def change(self, state):
+        """Enters state, restarting its timer"""
+        self.current = state
+        self.elapsed = 0.0
+
+    def tick(self, frame_time):
+        """Advances the state timer by frame_time seconds"""
+        self.elapsed += frame_time * 1000
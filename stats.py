@@ -1,10 +1,15 @@
 class Stats:
     """Class to track player stats
+    === Public Attributes ===
+    score: score of the current game
+    last_score: final score of the last game that was reset
     """
     def __init__(self, fof):
         self.settings = fof.settings
         self.score = 0
+        self.last_score = 0
         self.reset()
 
     def reset(self):
+        self.last_score = self.score
         self.score = 0
@@ -0,0 +1,49 @@
+"""LaserPool keeps at most settings.max_lasers lasers live."""
+from governor import QualityGovernor
+from headless import make_game
+
+
+def pool(max_lasers):
+    game = make_game(0, overrides={'max_lasers': max_lasers})
+    # Aim away from the orb so lasers get a direction
+    game.input.mouse_pos = (0, 0)
+    return game
+
+
+def test_fire_recycles_the_oldest_laser_at_the_cap():
+    game = pool(3)
+    lasers = [game.laser_pool.fire() for _ in range(4)]
+    assert len(game.lasers) == 3
+    # The oldest laser was recycled and fired again
+    assert lasers[3] is lasers[0]
+    assert game.laser_pool.created == 3
+
+
+def test_fire_with_max_lasers_0_fires_nothing():
+    game = pool(0)
+    assert game.laser_pool.fire() is None
+    assert len(game.lasers) == 0
+
+
+def test_trim_below_0_empties_the_group():
+    game = pool(8)
+    for _ in range(5):
+        game.laser_pool.fire()
+    game.laser_pool.trim(-1)
+    assert len(game.lasers) == 0
+    game.laser_pool.trim(-1)
+    assert len(game.lasers) == 0
+
+
+def test_governor_laser_cap_of_0():
+    game = pool(8)
+    game.settings.governor_max_lasers = 0
+    for _ in range(5):
+        game.laser_pool.fire()
+    governor = QualityGovernor(game)
+    governor._laser_cap(True)
+    assert len(game.lasers) == 0
+    assert game.laser_pool.fire() is None
+    governor._laser_cap(False)
+    assert game.settings.max_lasers == 8
+    assert game.laser_pool.fire() is not None
@@ -0,0 +1,46 @@
+"""Lasers fired at a stationary Cloud from several distances and angles.
+At low tick rates a laser moves further in a step than a Cloud is wide, so
+only swept lasers are sure to hit."""
+import math
+
+import pytest
+
+from headless import make_game
+
+DISTANCES = range(120, 360, 30)
+ANGLES = (0.0, 0.4, 1.1, 2.0, 2.9, 3.5, 4.4, 5.6)
+SHOTS = [(distance, angle) for distance in DISTANCES for angle in ANGLES]
+
+
+def hits(rate, swept):
+    """Number of SHOTS that kill the Cloud at sim_rate rate"""
+    game = make_game(0, overrides={'sim_rate': rate, 'swept_lasers': swept,
+                                   'cloud_speed': 0, 'max_enemies': 1})
+    count = 0
+    for distance, angle in SHOTS:
+        game.enemies.empty()
+        game.laser_pool.clear()
+        ox, oy = game.orb.rect.center
+        target = (round(ox + distance * math.cos(angle)),
+                  round(oy + distance * math.sin(angle)))
+        cloud = game.Cloud(target)
+        game.enemies.add(cloud)
+        game.input.mouse_pos = target
+        game.laser_pool.fire()
+        # A second is long enough for the laser to reach the Cloud or leave
+        for _ in range(rate):
+            game._step(game.dt)
+            if not game.lasers or not cloud.alive():
+                break
+        count += not cloud.alive()
+    return count
+
+
+@pytest.mark.parametrize('rate', (20, 30, 60, 144))
+def test_swept_lasers_never_tunnel(rate):
+    assert hits(rate, swept=True) == len(SHOTS)
+
+
+@pytest.mark.parametrize('rate', (20, 30, 60))
+def test_plain_lasers_tunnel_at_low_rates(rate):
+    assert hits(rate, swept=False) < len(SHOTS)
@@ -0,0 +1,49 @@
+from collections import OrderedDict
+
+import pygame
+
+
+class TextCache:
+    """Cache of fonts, keyed by file and size, and an LRU cache of rendered
+    text surfaces, keyed by file, size, string and colour. Nothing touches
+    the disk or re-renders glyphs for text that was drawn recently.
+
+    === Public Attributes ===
+    maxsize: most rendered surfaces kept
+    hits: renders served from the cache
+    misses: renders that had to draw glyphs
+    """
+    maxsize: int
+    hits: int
+    misses: int
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._fonts = {}
+        self._surfaces = OrderedDict()
+
+    def font(self, path, size):
+        """Returns the shared Font for the file at path, at size"""
+        font = self._fonts.get((path, size))
+        if font is None:
+            font = pygame.font.Font(path, size)
+            self._fonts[(path, size)] = font
+        return font
+
+    def render(self, path, size, text, colour):
+        """Returns text rendered (antialiased) in the font at path. Callers
+        must not draw onto the returned surface."""
+        key = (path, size, text, colour)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.font(path, size).render(text, True, colour)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.maxsize:
+            self._surfaces.popitem(last=False)
+        return surface
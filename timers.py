@@ -0,0 +1,147 @@
+class Timer:
+    """A callback waiting in a TimerWheel
+
+    === Public Attributes ===
+    due: wheel time (ms) the timer fires at
+    interval: time (ms) between firings of a repeating timer, else None
+    """
+    __slots__ = ('due', 'interval', 'callback', 'args')
+
+    def __init__(self, due, interval, callback, args):
+        self.due = due
+        self.interval = interval
+        self.callback = callback
+        self.args = args
+
+    @property
+    def active(self):
+        """True iff the timer will still fire"""
+        return self.callback is not None
+
+    def cancel(self):
+        """Stops the timer from firing; the wheel drops it when it comes
+        due"""
+        self.callback = None
+        self.args = ()
+
+
+# Level 0 has a slot for every ms of the next 256; each further level has
+# 64 slots spanning a whole turn of the level below
+_BITS = (8, 6, 6, 6)
+_SHIFTS = (0, 8, 14, 20)
+# Timers further ahead than this wait in an overflow list
+_HORIZON = 1 << 26
+
+
+class TimerWheel:
+    """Hierarchical timing wheel every cooldown in the game is scheduled on.
+    The game clock is read once per simulation step, and advancing the wheel
+    only touches the slots of the milliseconds that passed, so a step costs
+    time in proportion to the timers that fire, not to the number waiting.
+
+    Timers further out wait on coarser levels and drop to finer ones as
+    their time nears. Time only passes while the game steps, so pausing
+    freezes every timer.
+
+    === Public Attributes ===
+    clock: source of game time (ms)
+    time: wheel time (ms); while a timer fires, the time it was due
+    fired: number of timers that fired during the last advance
+    """
+    time: int
+    fired: int
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.time = clock.get_ticks()
+        self.fired = 0
+        self._levels = [[[] for _ in range(1 << bits)] for bits in _BITS]
+        self._overflow = []
+        # Timers in the wheel, cancelled ones included until dropped
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def schedule(self, delay, callback, *args):
+        """Calls callback(*args) once, delay ms (at least 1) after the
+        wheel's current time. Returns the Timer."""
+        timer = Timer(self.time + max(1, int(delay)), None, callback, args)
+        self._insert(timer)
+        return timer
+
+    def every(self, interval, callback, *args):
+        """Calls callback(*args) every interval ms, first interval ms from
+        now, until the returned Timer is cancelled"""
+        interval = max(1, int(interval))
+        timer = Timer(self.time + interval, interval, callback, args)
+        self._insert(timer)
+        return timer
+
+    def _insert(self, timer):
+        self._count += 1
+        delta = timer.due - self.time
+        if delta >= _HORIZON:
+            self._overflow.append(timer)
+            return
+        level = 0
+        while delta >= 1 << (_SHIFTS[level] + _BITS[level]):
+            level += 1
+        slots = self._levels[level]
+        slots[(timer.due >> _SHIFTS[level]) & (len(slots) - 1)].append(timer)
+
+    def advance(self):
+        """Moves the wheel up to the clock's current time, firing every
+        timer that came due in order"""
+        now = self.clock.get_ticks()
+        self.fired = 0
+        if not self._count:
+            # Nothing can fire, so the slots need not be visited
+            self.time = max(self.time, now)
+            return
+        levels = self._levels
+        for t in range(self.time + 1, now + 1):
+            self.time = t
+            if not t & 0xFF:
+                self._cascade(t)
+            slots = levels[0]
+            i = t & 0xFF
+            if slots[i]:
+                # Callbacks can only schedule timers due later than t
+                due, slots[i] = slots[i], []
+                self._count -= len(due)
+                for timer in due:
+                    self._fire(timer)
+        self.time = max(self.time, now)
+
+    def _cascade(self, t):
+        """Moves the timers of the coarse slots that start at time t down
+        to the finer levels, coarsest first"""
+        if not t & (_HORIZON - 1) and self._overflow:
+            waiting, self._overflow = self._overflow, []
+            self._count -= len(waiting)
+            for timer in waiting:
+                self._insert(timer)
+        for level in range(len(_BITS) - 1, 0, -1):
+            if t & ((1 << _SHIFTS[level]) - 1):
+                continue
+            slots = self._levels[level]
+            i = (t >> _SHIFTS[level]) & (len(slots) - 1)
+            moving, slots[i] = slots[i], []
+            self._count -= len(moving)
+            for timer in moving:
+                if timer.callback is not None:
+                    self._insert(timer)
+
+    def _fire(self, timer):
+        callback = timer.callback
+        if callback is None:
+            return
+        self.fired += 1
+        if timer.interval is not None:
+            # Re-armed before the call so the callback can cancel it
+            timer.due += timer.interval
+            self._insert(timer)
+        else:
+            timer.callback = None
+        callback(*timer.args)